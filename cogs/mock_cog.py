@@ -6,22 +6,90 @@ import aiohttp
 import logging
 from utils.rate_limiter import rate_limiter
 import asyncio
+import random
 import datetime
-from typing import Optional
-from utils.general import is_valid_emoji, format_message, quote_block
+from collections import OrderedDict
+from typing import Optional, Tuple
+from utils.general import is_emoji_char, format_message, quote_block
 from typing import Union
 
+import orjson
+
 logger = logging.getLogger(__name__)
 
+# Every age check below needs a number, so messages without one are skipped early
+_DIGIT_RE = re.compile(r'\d')
+
+# Explicit age statements fused into one scan; `<kind>_num` holds the digits for each kind
+_EXPLICIT_AGE_RE = re.compile(
+    r"(?P<born>born\s+in\s*(?:19|20)(?P<born_num>\d{2}))"
+    r"|(?P<turn>(?:i\s+turn(?:ed)?|turned)\s*(?P<turn_num>\d{1,2}))"
+    r"|(?P<iam>(?:i(?:\s+am|\s*'?m)?)\s*(?:a)?\s*(?P<iam_num>\d{1,2})\s*(?:y/?o|year|years?\s*old))"
+    r"|(?P<age>(?:i(?:\s+am|\s*'?m)?|me|my|myself)\s*(?:age\s+(?:is|being|=))?\s*(?P<age_num>\d{1,2}))"
+)
+
+# Age statements under 16 get their number rewritten to 18
+_AGE_REWRITE_PATTERNS = (
+    r"(?P<age>(?:age|am|'m|\s+is)\s*(?P<age_num>\d{1,2})(?:\s*(?:y/?o|years?\s*old))?)"
+    r"|(?P<born>born\s+in\s+(?:19|20)(?P<born_num>\d{2}))"
+    r"|(?P<turn>turn(?:ing|ed)?\s+(?P<turn_num>\d{1,2}))"
+)
+_AGE_REWRITE_RE = re.compile(_AGE_REWRITE_PATTERNS, re.IGNORECASE)
+
+# Age rewrite and self-referential pronouns in one pass; the matching group name picks
+# the replacement. "i am"/"i'm"/"iam" swallow a following age so it is still rewritten;
+# a bare "i" leaves its trailing space alone so "i is 5" still reaches the age branch.
+_CLEAN_RE = re.compile(
+    r"(?P<iam>\b(?:i\s+am|i'm|iam)\b(?P<iam_num>\s*\d{1,2})?|\bim\b)"
+    r"|(?P<me>\bme\b)"
+    r"|(?P<my>\bmy\b)"
+    r"|(?P<myself>\bmyself\b)"
+    r"|(?P<i>\bi\b)"
+    r"|" + _AGE_REWRITE_PATTERNS,
+    re.IGNORECASE
+)
+_PRONOUN_MAP = {
+    'iam': "you're",
+    'me': "you",
+    'my': "your",
+    'myself': "yourself",
+    'i': "you ",
+}
+
+def _replace_age(text: str, num: str) -> str:
+    """Replace an age under 16 inside text with 18"""
+    age = int(num)
+    return text.replace(str(age), "18") if age < 16 else text
+
+def _rewrite_age(match: re.Match) -> str:
+    kind = match.lastgroup
+    return _replace_age(match.group(0), match.group(f'{kind}_num'))
+
+def _rewrite_clean(match: re.Match) -> str:
+    kind = match.lastgroup
+    if kind == 'iam':
+        tail = match.group('iam_num')
+        return "you're" + _replace_age(tail, tail.strip()) if tail else "you're"
+    if kind in _PRONOUN_MAP:
+        return _PRONOUN_MAP[kind]
+    return _rewrite_age(match)
+
+# Oldest mimic replies are forgotten past this many tracked messages
+MAX_SENT_MESSAGES = 10_000
+
+# Attempts made by report_underage before giving up on a 429 storm
+REPORT_MAX_RETRIES = 5
+
 class Mock(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.prefix = self.bot.config_manager.command_prefix
         self.mimic_target = None
         self.is_mimicking = False
-        self.session = aiohttp.ClientSession()
-        self.sent_messages = {}  # Track {original_msg_id: our_msg}
+        self.session = None  # Created in cog_load, inside the running loop
+        self.sent_messages = OrderedDict()  # Track {original_msg_id: our_msg}, bounded
         self.custom_response = None  # Add this line
+        self._cleaned_custom = None  # custom_response after clean_message, computed once
         
         # Updated report types and reasons with correct values
         self.REPORT_TYPES = {
@@ -51,8 +119,8 @@ class Mock(commands.Cog):
             # Add other blocked terms as needed
         ]
 
-        # Command prefix pattern (matches common prefixes)
-        self.cmd_pattern = r'^[\.!$%^&*#@~/?,-;.]'
+        # Anchored run of selfbot prefixes and common bot prefixes
+        self._prefix_strip_re = re.compile(rf'^(?:{re.escape(self.prefix)}|[.!$%^&*#@~/?,\-;])+')
 
     async def report_underage(self, message, matched_text):
         """Report underage user via API using selfbot token"""
@@ -65,39 +133,49 @@ class Mock(commands.Cog):
             # Base payload - only include the essential fields
             payload = {
                 'channel_id': str(message.channel.id),
-                'message_id': str(message.id),  # We'll report the specific message
                 'reason': self.REPORT_REASONS['ILLEGAL'],
-                'report_type': self.REPORT_TYPES['MESSAGE']
             }
 
-            # Add guild_id only if it's not a DM
             if message.guild:
-                payload['guild_id'] = str(message.guild.id)
+                # Report the specific message in guilds
+                payload.update(
+                    message_id=str(message.id),
+                    guild_id=str(message.guild.id),
+                    report_type=self.REPORT_TYPES['MESSAGE']
+                )
             else:
-                # For DMs, switch to reporting the user instead of message
-                payload = {
-                    'channel_id': str(message.channel.id),
-                    'user_id': str(message.author.id),  # Report the user in DMs
-                    'reason': self.REPORT_REASONS['ILLEGAL'],
-                    'report_type': self.REPORT_TYPES['DM']
-                }
-
-            async with self.session.post(
-                'https://discord.com/api/v9/report', 
-                headers=headers, 
-                json=payload
-            ) as resp:
-                if resp.status in (201, 200):
-                    logger.info(f"Successfully reported underage user {message.author.id}")
-                else:
-                    error_data = await resp.json()
+                # For DMs, report the user instead of the message
+                payload.update(
+                    user_id=str(message.author.id),
+                    report_type=self.REPORT_TYPES['DM']
+                )
+
+            # Serialized once and reused across retries; Content-Type is set in headers
+            body = orjson.dumps(payload)
+
+            for attempt in range(REPORT_MAX_RETRIES):
+                async with self.session.post(
+                    'https://discord.com/api/v9/report', 
+                    headers=headers, 
+                    data=body
+                ) as resp:
+                    if resp.status in (201, 200):
+                        logger.info(f"Successfully reported underage user {message.author.id}")
+                        return
+
+                    error_data = orjson.loads(await resp.read())
                     logger.error(f"Failed to report user: Status {resp.status}, Response: {error_data}")
-                    
-                if resp.status == 429:
-                    retry_after = (await resp.json()).get('retry_after', 5)
-                    logger.warning(f"Rate limited, waiting {retry_after}s")
-                    await asyncio.sleep(retry_after)
-                    return await self.report_underage(message, matched_text)
+                    if resp.status != 429:
+                        return
+
+                    if attempt == REPORT_MAX_RETRIES - 1:
+                        break  # No point waiting out a rate limit we won't retry after
+
+                    retry_after = error_data.get('retry_after', 5)
+                    logger.warning(f"Rate limited, waiting {retry_after}s (attempt {attempt + 1}/{REPORT_MAX_RETRIES})")
+                await asyncio.sleep(retry_after + random.random() * 0.1)
+
+            logger.error(f"Giving up reporting user {message.author.id} after {REPORT_MAX_RETRIES} rate-limited attempts")
                     
         except Exception as e:
             logger.error(f"Error reporting underage user: {e}")
@@ -112,7 +190,20 @@ class Mock(commands.Cog):
 
     def is_safe_content(self, message: discord.Message) -> bool:
         """Enhanced safety check with improved underage user detection"""
-        content = message.content.lower()
+        matched_text = self.find_underage(message.content)
+        if matched_text is not None:
+            asyncio.create_task(self.report_underage(message, matched_text))
+            return False
+        return True
+
+    def find_underage(self, raw: str) -> Optional[str]:
+        """Return the text that gave away an age under 16, or None if the content is safe.
+        Pure string work so it can run off the event loop."""
+        content = raw.lower()
+
+        # Shortest possible age statement is "i" followed by a digit
+        if len(content) < 2 or not _DIGIT_RE.search(content):
+            return None
         
         # Patterns that indicate the message author is referring to themselves
         self_reference_patterns = [
@@ -143,100 +234,77 @@ class Mock(commands.Cog):
                     age = int(num_str)
                     # Report if age is suspiciously young (under 16)
                     if age < 16:
-                        asyncio.create_task(self.report_underage(message, content))
-                        return False
+                        return content
                 except ValueError:
                     continue
         
         # Check for explicit age statements
-        explicit_age_patterns = [
-            r'(?:i(?:\s+am|\s*\'?m)?|me|my|myself)\s*(?:age\s+(?:is|being|=))?\s*(\d{1,2})',
-            r'(?:i\s+turn(?:ed)?|turned)\s*(\d{1,2})',
-            r'(?:i(?:\s+am|\s*\'?m)?)\s*(?:a)?\s*(\d{1,2})\s*(?:y/?o|year|years?\s*old)',
-            r'(?:born\s+in)\s*(?:19|20)(\d{2})',
-        ]
-        
         current_year = datetime.datetime.now().year
         
-        for pattern in explicit_age_patterns:
-            matches = re.finditer(pattern, content)
-            for match in matches:
-                try:
-                    if 'born in' in match.group(0).lower():
-                        birth_year = int('19' + match.group(1)) if match.group(1).startswith('9') else int('20' + match.group(1))
-                        age = current_year - birth_year
-                    else:
-                        age = int(match.group(1))
-                    
-                    if age < 16:
-                        asyncio.create_task(self.report_underage(message, match.group(0)))
-                        return False
-                except (ValueError, IndexError):
-                    continue
+        for match in _EXPLICIT_AGE_RE.finditer(content):
+            kind = match.lastgroup
+            num = match.group(f'{kind}_num')
+            if kind == 'born':
+                birth_year = int('19' + num) if num.startswith('9') else int('20' + num)
+                age = current_year - birth_year
+            else:
+                age = int(num)
+            
+            if age < 16:
+                return match.group(0)
         
-        return True
+        return None
+
+    def _cpu_process(self, raw: str, is_custom: bool) -> Tuple[Optional[str], Optional[str]]:
+        """Run the regex-heavy safety check and cleaning for one message.
+        Returns (underage_match, cleaned_content); cleaning is skipped for unsafe or custom replies."""
+        matched_text = self.find_underage(raw)
+        if matched_text is not None or is_custom:
+            return matched_text, None
+        return None, self.clean_message(raw)
 
     def clean_message(self, content: str, is_custom: bool = False) -> str:
         """Clean message content and normalize special fonts"""
-        # Normalize special fonts/characters to regular text, preserving emojis
-        temp = ""
-        skip_until = 0
-        
-        # Preserve default emojis and custom emojis
-        for i, char in enumerate(content):
-            if i < skip_until:
-                continue
+        # Normalize special fonts/characters to regular text, preserving emojis.
+        # Plain ASCII is left as is by unidecode, so only non-ASCII text needs the scan.
+        if not content.isascii():
+            temp = ""
+            skip_until = 0
             
-            # Check for custom emoji <:name:id> or <a:name:id>
-            if char == '<' and i + 1 < len(content):
-                if content[i+1] == ':' or (content[i+1] == 'a' and i + 2 < len(content) and content[i+2] == ':'):
-                    emoji_end = content.find('>', i)
-                    if emoji_end != -1:
-                        temp += content[i:emoji_end+1]
-                        skip_until = emoji_end + 1
-                        continue
-                        
-            # Check for default emoji (Unicode)
-            if is_valid_emoji(char):
-                temp += char
-            else:
-                temp += unidecode(char)
+            # Preserve default emojis and custom emojis
+            for i, char in enumerate(content):
+                if i < skip_until:
+                    continue
                 
-        content = temp
-        
-        # Remove selfbot prefix and common bot prefixes
-        while content.startswith(self.prefix) or re.match(self.cmd_pattern, content):
-            content = content[1:]
-        
-        # Replace age numbers under 16 with 18
-        def replace_age(match):
-            age = int(match.group(1))
-            return match.group(0).replace(str(age), "18") if age < 16 else match.group(0)
+                # Check for custom emoji <:name:id> or <a:name:id>
+                if char == '<' and i + 1 < len(content):
+                    if content[i+1] == ':' or (content[i+1] == 'a' and i + 2 < len(content) and content[i+2] == ':'):
+                        emoji_end = content.find('>', i)
+                        if emoji_end != -1:
+                            temp += content[i:emoji_end+1]
+                            skip_until = emoji_end + 1
+                            continue
+                
+                if char.isascii():
+                    temp += char
+                # Check for default emoji (Unicode)
+                elif is_emoji_char(char):
+                    temp += char
+                else:
+                    temp += unidecode(char)
+                    
+            content = temp
         
-        # Age-related patterns to rewrite
-        age_patterns = [
-            r'(?i)(?:age|am|\'m|\s+is)\s*(\d{1,2})(?:\s*(?:y/?o|years?\s*old))?',
-            r'(?i)(?:born\s+in\s+(?:19|20)(\d{2}))',
-            r'(?i)(?:turn(?:ing|ed)?\s+)(\d{1,2})',
-        ]
+        # Remove selfbot prefix and common bot prefixes: advance past the run, slice once
+        prefix_run = self._prefix_strip_re.match(content)
+        if prefix_run:
+            content = content[prefix_run.end():]
         
-        for pattern in age_patterns:
-            content = re.sub(pattern, replace_age, content)
-          # Replace self-referential pronouns
-        if not is_custom:
-            pronouns_map = {
-                r'\b(?:i am|im|i\'m)\b': "you're",
-                r'\biam\b': "you're", 
-                r'\bi\s+am\b': "you're",
-                r'\bi\'m\b': "you're",
-                r'\bme\b': "you",
-                r'\bmy\b': "your",
-                r'\bmyself\b': "yourself",
-                r'\bi(?:\s+|\b)': "you ",
-            }
-            
-            for pattern, replacement in pronouns_map.items():
-                content = re.sub(pattern, replacement, content, flags=re.IGNORECASE)
+        # Replace age numbers under 16 with 18 and, for mimicked text, self-referential pronouns
+        if is_custom:
+            content = _AGE_REWRITE_RE.sub(_rewrite_age, content)
+        else:
+            content = _CLEAN_RE.sub(_rewrite_clean, content)
             
             # Clean up any double spaces only for non-custom responses
             content = ' '.join(content.split())
@@ -276,19 +344,28 @@ class Mock(commands.Cog):
             self.is_mimicking = False
             self.mimic_target = None
             self.custom_response = None
+            self._cleaned_custom = None
             return
     
         self.mimic_target = user.id
         self.is_mimicking = True 
         self.custom_response = custom_response
+        # The custom reply never changes, so clean it here instead of per message
+        self._cleaned_custom = self.clean_message(custom_response, is_custom=True) if custom_response else None
     
 
+    def _remember(self, original_id: int, sent_msg: discord.Message):
+        """Track a mimic reply, evicting the oldest entry once the cap is reached"""
+        self.sent_messages[original_id] = sent_msg
+        if len(self.sent_messages) > MAX_SENT_MESSAGES:
+            self.sent_messages.popitem(last=False)
+
     @rate_limiter(command_only=True)
     async def send_mimic_message(self, original_message: discord.Message, content: str) -> Optional[discord.Message]:
         """Send a mimicked message with rate limiting"""
         try:
             sent_msg = await original_message.reply(content)
-            self.sent_messages[original_message.id] = sent_msg
+            self._remember(original_message.id, sent_msg)
             return sent_msg
         except discord.Forbidden:
             logger.error(f"Failed to send mimic message: Forbidden")
@@ -296,6 +373,7 @@ class Mock(commands.Cog):
             self.is_mimicking = False
             self.mimic_target = None
             self.custom_response = None
+            self._cleaned_custom = None
             return None
 
 
@@ -307,15 +385,20 @@ class Mock(commands.Cog):
         if message.author.bot:
             return
         
-        if self.custom_response:
-            content = self.custom_response
-            content = self.clean_message(content, is_custom=True)
-        else:
-            content = message.content
-            content = self.clean_message(content)
+        # Regex work runs in a worker thread so bursts don't stall the gateway
+        custom = self._cleaned_custom
+        matched_text, content = await asyncio.to_thread(self._cpu_process, message.content, custom is not None)
         
-        if not self.is_safe_content(message):
+        # stopmock (or a new target) may have landed while the thread was running
+        if not self.is_mimicking or message.author.id != self.mimic_target:
+            return
+        
+        if matched_text is not None:
+            asyncio.create_task(self.report_underage(message, matched_text))
             return
+        
+        if custom is not None:
+            content = custom
             
         content = self.clean_mentions(content, message)
         
@@ -336,6 +419,10 @@ class Mock(commands.Cog):
 
     async def cog_load(self):
         """Register event handlers when cog is loaded"""
+        self.session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=20, ttl_dns_cache=300)
+        )
+
         event_manager = self.bot.get_cog('EventManager')
         if event_manager:
             event_manager.register_handler('on_message', self.__class__.__name__, self._handle_message)
@@ -349,9 +436,12 @@ class Mock(commands.Cog):
         
         self.is_mimicking = False
         self.mimic_target = None
+        self.custom_response = None
+        self._cleaned_custom = None
         self.sent_messages.clear()
         if self.session:
             await self.session.close()
+        self.session = None
 
     @commands.command(aliases=['smk'])
     async def stopmock(self, ctx):
@@ -366,6 +456,7 @@ class Mock(commands.Cog):
         # Clear any pending messages
         self.sent_messages.clear()
         self.custom_response = None
+        self._cleaned_custom = None
         
         if self.mimic_target is not None:
             self.mimic_target = None
@@ -2,54 +2,141 @@ import discord
 from discord.ext import commands, tasks
 import re
 import logging
-import json
 import os
 import random
-from utils.general import format_message, quote_block
+import asyncio
+from collections import OrderedDict
+from utils.general import format_message, quote_block, auto_delete_delay
+
+# Prefer google-re2's linear-time engine for the URL patterns when it's installed
+try:
+    import re2 as _re
+except ImportError:
+    _re = re
 
 logger = logging.getLogger(__name__)
 
+# Caps for the per-code caches; oldest codes are forgotten first
+MAX_SEEN_CODES = 10_000
+MAX_REDEEMED_CODES = 1_000
+MAX_FAILED_CODES = 500
+
+# Shortest content that can hold a link: "discord.gg/" plus a 2-char invite code
+MIN_LINK_LENGTH = len('discord.gg/') + 2
+
+_GIFT_URL = r'(?:discord\.gift\/|discord\.com\/gifts\/|discordapp\.com\/gifts\/)'
+_INVITE_URL = r'(?:discord\.gg\/|discord\.com\/invite\/|discordapp\.com\/invite\/)'
+
 class NitroSniper(commands.Cog):
     # Use a single compiled regex pattern with non-capturing groups (?:)
-    GIFT_PATTERN = re.compile(r'(?:discord\.gift\/|discord\.com\/gifts\/|discordapp\.com\/gifts\/)([a-zA-Z0-9]{16,24})', re.IGNORECASE)
+    GIFT_PATTERN = _re.compile(_GIFT_URL + r'([a-zA-Z0-9]{16,24})', _re.IGNORECASE)
     # Pattern to match Discord invites
-    INVITE_PATTERN = re.compile(r'(?:discord\.gg\/|discord\.com\/invite\/|discordapp\.com\/invite\/)([a-zA-Z0-9]{2,10})', re.IGNORECASE)
+    INVITE_PATTERN = _re.compile(_INVITE_URL + r'([a-zA-Z0-9]{2,10})', _re.IGNORECASE)
+    # Gifts and invites in one pass over message content, told apart by group name
+    COMBINED_PATTERN = _re.compile(
+        _GIFT_URL + r'(?P<gift>[a-zA-Z0-9]{16,24})|' + _INVITE_URL + r'(?P<invite>[a-zA-Z0-9]{2,10})',
+        _re.IGNORECASE
+    )
+    
+    # Status panel colour/text, indexed by the enabled flag
+    _STATUS_COLOR = ("\u001b[0;31m", "\u001b[0;32m")
+    _STATUS_TEXT = ("Disabled", "Enabled")
+    
+    # Counters kept as plain int attributes so the hot path is a direct increment
+    STAT_NAMES = (
+        'total_seen',
+        'invalid_length',
+        'already_seen',
+        'already_redeemed',
+        'failed_redeem',
+        'successful_redeem',
+        'rate_limited'
+    )
     
     def __init__(self, bot):
         self.bot = bot
         self.enabled = False
         
         # Initialize empty statistics
-        self.stats = {
-            'total_seen': 0,
-            'invalid_length': 0,
-            'already_seen': 0,
-            'already_redeemed': 0,
-            'failed_redeem': 0,
-            'successful_redeem': 0,
-            'rate_limited': 0
-        }
+        self._zero_stats()
         
-        self.seen_codes = set()
-        self.redeemed_codes = set()
-        self.failed_codes = {}
+        # Bounded LRUs used as ordered sets (values are unused)
+        self.seen_codes = OrderedDict()
+        self.redeemed_codes = OrderedDict()
+        self.failed_codes = OrderedDict()  # Last failure reason per code, bounded
         # self.snipe_cooldown = commands.CooldownMapping.from_cooldown(1, 5, commands.BucketType.user)
 
         # File path for saved invites
         self.invites_file = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'config', 'saved_invites.txt')
+        # Create the invites directory once rather than on every load/write
+        self._invites_dir = os.path.dirname(self.invites_file)
+        os.makedirs(self._invites_dir, exist_ok=True)
         
         # Set for caching loaded invites        
         self.loaded_invites = set()
         self.invites_loaded = False
+        # Tuple snapshot of loaded_invites for sampling; None until rebuilt after a change
+        self._invites_tuple = None
+        self._invites_load_lock = asyncio.Lock()
+        # New invites waiting for the next periodic flush to disk
+        self._pending_invites = []
 
         # Load settings from config during initialization
         nitro_settings = self.bot.config_manager.nitro_sniper
         self.enabled = nitro_settings.get('enabled', False)
+
+        # Status panel layout never changes, only the numbers do
+        self._status_template = self._build_status_template(include_invites=True)
+        self._status_template_no_invites = self._build_status_template(include_invites=False)
         
     def get_padding(self, labels: list) -> int:
         """Calculate padding for consistent alignment based on longest label"""
         return max(len(label) - 1 for label in labels) + 2 if labels else 2
 
+    def _build_status_template(self, include_invites: bool) -> str:
+        """Build the nitro status panel once as a str.format template"""
+        message_parts = [
+            "```ansi\n"
+        ]
+        
+        # Status section with proper padding like in info command
+        message_parts.append("\u001b[30m\u001b[1m\u001b[4mStatus\u001b[0m\n")
+        
+        # Calculate padding for labels
+        status_labels = ["Status", "Total", "Invs"]
+        status_padding = self.get_padding(status_labels)
+        
+        message_parts.append(f"\u001b[0;37m{'Status':<{status_padding}}\u001b[30m| {{status_color}}{{status_text}}\u001b[0m\n")
+        message_parts.append(f"\u001b[0;37m{'Total':<{status_padding}}\u001b[30m| \u001b[0;34m{{total_seen:,}}\u001b[0m\n")
+        if include_invites:
+            message_parts.append(f"\u001b[0;37m{'Invs':<{status_padding}}\u001b[30m| \u001b[0;34m{{invites:,}}\u001b[0m\n")
+        
+        # Statistics section with proper padding
+        message_parts.append("\n\u001b[30m\u001b[1m\u001b[4mStats\u001b[0m\n")
+        
+        # Calculate padding for statistics labels
+        stats_labels = ["Bad", "Dupes", "Tried", "Failed", "Rated", "Claims"]
+        stats_padding = self.get_padding(stats_labels)
+        
+        message_parts.append(f"\u001b[0;37m{'Bad':<{stats_padding}}\u001b[30m| \u001b[0;34m{{invalid_length:,}}\u001b[0m\n")
+        message_parts.append(f"\u001b[0;37m{'Dupes':<{stats_padding}}\u001b[30m| \u001b[0;34m{{already_seen:,}}\u001b[0m\n")
+        message_parts.append(f"\u001b[0;37m{'Tried':<{stats_padding}}\u001b[30m| \u001b[0;34m{{already_redeemed:,}}\u001b[0m\n")
+        message_parts.append(f"\u001b[0;37m{'Failed':<{stats_padding}}\u001b[30m| \u001b[0;34m{{failed_redeem:,}}\u001b[0m\n")
+        message_parts.append(f"\u001b[0;37m{'Rated':<{stats_padding}}\u001b[30m| \u001b[0;34m{{rate_limited:,}}\u001b[0m\n")
+        message_parts.append(f"\u001b[0;37m{'Claims':<{stats_padding}}\u001b[30m| \u001b[0;32m{{successful_redeem:,}}\u001b[0m\n")
+        
+        # Help section
+        message_parts.append("\n\u001b[30m\u001b[1m\u001b[4mCommands\u001b[0m\n")
+        commands_labels = [".nitro on/off", ".nitro invites"]
+        commands_padding = self.get_padding(commands_labels)
+        
+        message_parts.append(f"\u001b[0;37m{'.nitro on/off':<{commands_padding}}\u001b[30m| \u001b[0;34mToggle\u001b[0m\n")
+        message_parts.append(f"\u001b[0;37m{'.nitro invites':<{commands_padding}}\u001b[30m| \u001b[0;34minvites\u001b[0m\n")
+        
+        # Close the code block
+        message_parts.append("```")
+        return quote_block(''.join(message_parts))
+
     @tasks.loop(hours=24)
     async def auto_reset_stats(self):
         """Reset statistics every 24 hours"""
@@ -58,41 +145,49 @@ class NitroSniper(commands.Cog):
 
     def reset_stats(self):
         """Reset all statistics to zero"""
-        self.stats = {key: 0 for key in self.stats}
+        self._zero_stats()
         self.seen_codes.clear()
         self.redeemed_codes.clear()
         self.failed_codes.clear()
+        self._invites_tuple = None
         logger.info("Reset Nitro sniper statistics")
 
-    def update_stats(self, stat_type: str):
-        """Update statistics counter for given type"""
-        if stat_type in self.stats:
-            self.stats[stat_type] += 1
-            if stat_type == 'total_seen':
-                # Save milestone stats
-                if self.stats['total_seen'] % 100 == 0:
-                    logger.info(f"Milestone: {self.stats['total_seen']} gifts seen")
-            logger.debug(f"Updated {stat_type} stat: {self.stats[stat_type]}")
+    @staticmethod
+    def _remember(cache: OrderedDict, key, value=None, limit: int = MAX_SEEN_CODES):
+        """Insert into a bounded LRU, evicting the oldest entry past the limit"""
+        cache[key] = value
+        cache.move_to_end(key)
+        if len(cache) > limit:
+            cache.popitem(last=False)
+
+    def _zero_stats(self):
+        """Set every statistics counter to zero"""
+        for name in self.STAT_NAMES:
+            setattr(self, name, 0)
+
+    @property
+    def stats(self) -> dict:
+        """Statistics counters as a dict, for the status display"""
+        return {name: getattr(self, name) for name in self.STAT_NAMES}
 
     def _load_invites(self):
         """Load all invites into memory once"""
         if self.invites_loaded:
             return
-            
-        # Ensure the directory exists
-        os.makedirs(os.path.dirname(self.invites_file), exist_ok=True)
         
         if os.path.exists(self.invites_file):
             try:
+                # One bulk C-level split instead of stripping line by line
                 with open(self.invites_file, 'r') as f:
-                    self.loaded_invites = set(line.strip() for line in f if line.strip())
+                    self.loaded_invites = set(f.read().split())
+                self._invites_tuple = None
             except Exception as e:
-                logger.error(f"Failed to load invites: {e}")
+                logger.error("Failed to load invites: %s", e)
         
         self.invites_loaded = True
 
     def save_invite(self, invite_code):
-        """Save a Discord invite code to the file efficiently"""
+        """Record a Discord invite code and queue it for the next batched file write"""
         if not invite_code:
             return False
             
@@ -104,21 +199,52 @@ class NitroSniper(commands.Cog):
             if invite_code in self.loaded_invites:
                 return False
                 
-            # Add to set and append to file (no need to read the whole file again)
+            # Add to set and queue for the next batched write
             self.loaded_invites.add(invite_code)
-            
-            # Ensure the directory exists
-            os.makedirs(os.path.dirname(self.invites_file), exist_ok=True)
-            
-            # Append to file
-            with open(self.invites_file, 'a') as f:
-                f.write(f"{invite_code}\n")
+            self._invites_tuple = None
+            self._pending_invites.append(invite_code)
                 
             return True
         except Exception as e:
-            logger.error(f"Failed to save invite {invite_code}: {e}")
+            logger.error("Failed to save invite %s: %s", invite_code, e)
+            return False
+
+    async def _load_invites_async(self):
+        """Load invites in a worker thread so the first load doesn't block the event loop"""
+        if self.invites_loaded:
+            return
+        # Concurrent handlers wait for one load instead of each replacing the set
+        async with self._invites_load_lock:
+            if not self.invites_loaded:
+                await asyncio.to_thread(self._load_invites)
+
+    def _append_invites(self, invites: list) -> bool:
+        """Append a batch of invites to the file in a single write (runs in a worker thread)"""
+        try:
+            with open(self.invites_file, 'a') as f:
+                f.write('\n'.join(invites) + '\n')
+            return True
+        except Exception as e:
+            logger.error("Failed to write %d invites: %s", len(invites), e)
             return False
 
+    async def _write_pending_invites(self):
+        """Flush queued invites to disk off the event loop"""
+        if not self._pending_invites:
+            return
+            
+        # Swap the queue on the loop thread so nothing appended meanwhile is lost
+        pending = self._pending_invites
+        self._pending_invites = []
+        if not await asyncio.to_thread(self._append_invites, pending):
+            # Keep them queued so the next flush retries
+            self._pending_invites[:0] = pending
+
+    @tasks.loop(seconds=30)
+    async def _flush_invites(self):
+        """Periodically flush queued invites to disk"""
+        await self._write_pending_invites()
+
     def get_random_invites(self, count=10):
         """Get random invites from the saved invites file"""
         # Load invites if not already loaded
@@ -128,10 +254,12 @@ class NitroSniper(commands.Cog):
             return []
             
         try:
-            # Return random invites, up to the requested count
-            return random.sample(list(self.loaded_invites), min(count, len(self.loaded_invites)))
+            # Snapshot is only rebuilt after invites change, so repeated calls sample in O(k)
+            if self._invites_tuple is None:
+                self._invites_tuple = tuple(self.loaded_invites)
+            return random.sample(self._invites_tuple, min(count, len(self._invites_tuple)))
         except Exception as e:
-            logger.error(f"Error getting random invites: {e}")
+            logger.error("Error getting random invites: %s", e)
             return []
 
     @commands.command(aliases=['nt'])
@@ -148,29 +276,15 @@ class NitroSniper(commands.Cog):
             if not self.enabled:
                 self.reset_stats()  # This clears seen_codes, redeemed_codes, and failed_codes
             
-            # Get current config and update it
-            with open('config.json', 'r+') as f:
-                config = json.load(f)
-                if 'user_settings' not in config:
-                    config['user_settings'] = {}
-                if self.bot.config_manager.token not in config['user_settings']:
-                    config['user_settings'][self.bot.config_manager.token] = {}
-                    
-                if 'nitro_sniper' not in config['user_settings'][self.bot.config_manager.token]:
-                    config['user_settings'][self.bot.config_manager.token]['nitro_sniper'] = {
-                        'enabled': self.enabled,
-                    }
-                else:
-                    config['user_settings'][self.bot.config_manager.token]['nitro_sniper']['enabled'] = self.enabled
-                
-                # Save config
-                f.seek(0)
-                json.dump(config, f, indent=4)
-                f.truncate()
+            # Update the in-memory settings; config_manager re-uses its cached parse
+            # and writes config.json atomically via a temp file
+            config_manager = self.bot.config_manager
+            config_manager.nitro_sniper = {**(config_manager.nitro_sniper or {}), 'enabled': self.enabled}
+            await config_manager.save_config_async()
     
             await ctx.send(
                 format_message(f"Nitro sniping {'enabled' if self.enabled else 'disabled'}"),
-                delete_after=self.bot.config_manager.auto_delete.delay if self.bot.config_manager.auto_delete.enabled else None
+                delete_after=auto_delete_delay(self.bot)
             )
         elif setting and setting.lower() == 'invites':
             # Validate amount
@@ -180,12 +294,13 @@ class NitroSniper(commands.Cog):
                 amount = 50
                 
             # Get random invites with the specified amount
+            await self._load_invites_async()
             invites = self.get_random_invites(amount)
             
             if not invites:
                 await ctx.send(
                     format_message("No saved invites found."),
-                    delete_after=self.bot.config_manager.auto_delete.delay if self.bot.config_manager.auto_delete.enabled else None
+                    delete_after=auto_delete_delay(self.bot)
                 )
                 return
                 
@@ -194,58 +309,23 @@ class NitroSniper(commands.Cog):
             
             await ctx.send(
                 f"**{len(invites)} Random server invites:**\n```\n{formatted_invites}\n```",
-                delete_after=self.bot.config_manager.auto_delete.delay if self.bot.config_manager.auto_delete.enabled else None
+                delete_after=auto_delete_delay(self.bot)
             )        
         else:            # Load invites to ensure the count is available
-            self._load_invites()
-            
-            # Build a message in the style of the info command
-            status_color = "\u001b[0;32m" if self.enabled else "\u001b[0;31m"
-            status_text = "Enabled" if self.enabled else "Disabled"
-            
-            message_parts = [
-                "```ansi\n"
-            ]
-            
-            # Status section with proper padding like in info command
-            message_parts.append("\u001b[30m\u001b[1m\u001b[4mStatus\u001b[0m\n")
-            
-            # Calculate padding for labels
-            status_labels = ["Status", "Total", "Invs"]
-            status_padding = self.get_padding(status_labels)
-            
-            message_parts.append(f"\u001b[0;37mStatus{' ' * (status_padding - len('Status'))}\u001b[30m| {status_color}{status_text}\u001b[0m\n")
-            message_parts.append(f"\u001b[0;37mTotal{' ' * (status_padding - len('Total'))}\u001b[30m| \u001b[0;34m{self.stats['total_seen']:,}\u001b[0m\n")
-            if self.invites_loaded:
-                message_parts.append(f"\u001b[0;37mInvs{' ' * (status_padding - len('Invs'))}\u001b[30m| \u001b[0;34m{len(self.loaded_invites):,}\u001b[0m\n")
-            
-            # Statistics section with proper padding
-            message_parts.append("\n\u001b[30m\u001b[1m\u001b[4mStats\u001b[0m\n")
-            
-            # Calculate padding for statistics labels
-            stats_labels = ["Bad", "Dupes", "Tried", "Failed", "Rated", "Claims"]
-            stats_padding = self.get_padding(stats_labels)
-            
-            message_parts.append(f"\u001b[0;37mBad{' ' * (stats_padding - len('Bad'))}\u001b[30m| \u001b[0;34m{self.stats['invalid_length']:,}\u001b[0m\n")
-            message_parts.append(f"\u001b[0;37mDupes{' ' * (stats_padding - len('Dupes'))}\u001b[30m| \u001b[0;34m{self.stats['already_seen']:,}\u001b[0m\n")
-            message_parts.append(f"\u001b[0;37mTried{' ' * (stats_padding - len('Tried'))}\u001b[30m| \u001b[0;34m{self.stats['already_redeemed']:,}\u001b[0m\n")
-            message_parts.append(f"\u001b[0;37mFailed{' ' * (stats_padding - len('Failed'))}\u001b[30m| \u001b[0;34m{self.stats['failed_redeem']:,}\u001b[0m\n")
-            message_parts.append(f"\u001b[0;37mRated{' ' * (stats_padding - len('Rated'))}\u001b[30m| \u001b[0;34m{self.stats['rate_limited']:,}\u001b[0m\n")
-            message_parts.append(f"\u001b[0;37mClaims{' ' * (stats_padding - len('Claims'))}\u001b[30m| \u001b[0;32m{self.stats['successful_redeem']:,}\u001b[0m\n")
+            await self._load_invites_async()
             
-            # Help section
-            message_parts.append("\n\u001b[30m\u001b[1m\u001b[4mCommands\u001b[0m\n")
-            commands_labels = [".nitro on/off", ".nitro invites"]
-            commands_padding = self.get_padding(commands_labels)
-            
-            message_parts.append(f"\u001b[0;37m.nitro on/off{' ' * (commands_padding - len('.nitro on/off'))}\u001b[30m| \u001b[0;34mToggle\u001b[0m\n")
-            message_parts.append(f"\u001b[0;37m.nitro invites{' ' * (commands_padding - len('.nitro invites'))}\u001b[30m| \u001b[0;34minvites\u001b[0m\n")
-            
-            # Close the code block
-            message_parts.append("```")
+            # Fill the prebuilt status panel
+            status_color = self._STATUS_COLOR[bool(self.enabled)]
+            status_text = self._STATUS_TEXT[bool(self.enabled)]
+            template = self._status_template if self.invites_loaded else self._status_template_no_invites
     
-            await ctx.send(quote_block(''.join(message_parts)),
-                delete_after=self.bot.config_manager.auto_delete.delay if self.bot.config_manager.auto_delete.enabled else None
+            await ctx.send(template.format(
+                    status_color=status_color,
+                    status_text=status_text,
+                    invites=len(self.loaded_invites),
+                    **self.stats
+                ),
+                delete_after=auto_delete_delay(self.bot)
             )
 
     async def _handle_message(self, message):
@@ -253,105 +333,118 @@ class NitroSniper(commands.Cog):
         if not self.enabled or message.author.bot:
             return
 
-        # Check for Nitro gift codes
+        content = message.content
+        # Short plain messages ("hi", "lol", emoji) can't carry a gift or invite
+        if (not message.embeds and not getattr(message, 'giftCodes', None)
+                and (not content or len(content) < MIN_LINK_LENGTH)):
+            return
+
+        # Check message content for gift and invite links in a single scan
         codes = []
-        
-        # Check message content for gift links
-        codes.extend([match.group(1) for match in self.GIFT_PATTERN.finditer(message.content) 
-         if match.group(1)])
+        invites = []
+        # Every gift/invite URL contains "discord"; a substring test is far cheaper than the regex
+        if content and 'discord' in content.lower():
+            for match in self.COMBINED_PATTERN.finditer(content):
+                kind = match.lastgroup
+                (codes if kind == 'gift' else invites).append(match.group(kind))
          
-        # Check message embeds
+        # Check message embeds for gifts and invites in one pass
         for embed in message.embeds:
-            if embed.type == "gift" and embed.url:
-                # Extract code from embed URL
-                if match := self.GIFT_PATTERN.search(embed.url):
-                    codes.append(match.group(1))
+            url = embed.url
+            if not url:
+                continue
+            if embed.type == "gift" and (match := self.GIFT_PATTERN.search(url)):
+                codes.append(match.group(1))
+            elif match := self.INVITE_PATTERN.search(url):
+                invites.append(match.group(1))
                     
         # Check for direct gift codes in message
         if hasattr(message, 'giftCodes') and message.giftCodes:
             codes.extend(code for code in message.giftCodes if code and len(code) >= 16)
         
+        # Nothing matched anywhere, which is the common case
+        if not codes and not invites:
+            return
+        
+        # A gift link usually shows up in both content and its auto-embed; keep one of each
+        codes = list(dict.fromkeys(codes))
+        
         # Process gift codes
         for code in codes:
             if not code:
                 continue
-            self.update_stats("total_seen")
+            self.total_seen += 1
+            if self.total_seen % 100 == 0:
+                logger.info("Milestone: %d gifts seen", self.total_seen)
 
             if len(code) < 16:
-                self.update_stats("invalid_length")
+                self.invalid_length += 1
                 continue
                 
             if code in self.seen_codes:
-                self.update_stats("already_seen")
+                self.seen_codes.move_to_end(code)
+                self.already_seen += 1
                 continue
 
-            self.seen_codes.add(code)
+            self._remember(self.seen_codes, code)
                 
             try:
                 # Fetch gift info
                 gift = await self.bot.fetch_gift(code)
                 
                 if gift.redeemed:
-                    logger.info(f"Gift code {code} already redeemed")
-                    self.update_stats("already_redeemed")
+                    logger.info("Gift code %s already redeemed", code)
+                    self.already_redeemed += 1
                     continue
 
                 # Attempt to redeem
                 result = await gift.redeem(channel=message.channel)
                 
-                self.redeemed_codes.add(code)
-                self.update_stats("successful_redeem")
+                self._remember(self.redeemed_codes, code, limit=MAX_REDEEMED_CODES)
+                self.successful_redeem += 1
                 
                 channel_name = message.channel.name if isinstance(message.channel, discord.TextChannel) else "DM"
                 logger.info(
-                    f"Successfully claimed Nitro gift:\n"
-                    f"Code: {code}\n"
-                    f"Channel: {channel_name} ({message.channel.id})\n"
-                    f"Server: {message.guild.name if message.guild else 'DM'}\n"
-                    f"Result: {result}"
+                    "Successfully claimed Nitro gift:\n"
+                    "Code: %s\n"
+                    "Channel: %s (%s)\n"
+                    "Server: %s\n"
+                    "Result: %s",
+                    code, channel_name, message.channel.id,
+                    message.guild.name if message.guild else 'DM', result
                 )
                 continue # Don't catch exceptions if successful
 
             except discord.NotFound:
-                logger.debug(f"Invalid gift code: {code}")
-                self.failed_codes[code] = "Invalid code"
-                self.update_stats("failed_redeem")
+                logger.debug("Invalid gift code: %s", code)
+                self._remember(self.failed_codes, code, "Invalid code", limit=MAX_FAILED_CODES)
+                self.failed_redeem += 1
 
             except discord.HTTPException as e:
                 if e.status == 429:
-                    logger.warning(f"Rate limited while claiming {code}")
-                    self.update_stats("rate_limited")
+                    logger.warning("Rate limited while claiming %s", code)
+                    self.rate_limited += 1
                 else:
-                    logger.error(f"Failed to claim gift {code}: {e}")
-                    self.failed_codes[code] = str(e)
-                    self.update_stats("failed_redeem")            
+                    logger.error("Failed to claim gift %s: %s", code, e)
+                    self._remember(self.failed_codes, code, str(e), limit=MAX_FAILED_CODES)
+                    self.failed_redeem += 1            
             except Exception as e:
-                # Handle the 'outbound_title' error specifically
-                error_msg = str(e)
-                if "'outbound_title'" in error_msg:
-                    logger.warning(f"Discord API change detected when claiming gift {code}")
+                # Handle the 'outbound_title' error specifically (a KeyError from the gift payload);
+                # inspect args rather than rendering the whole exception
+                first_arg = e.args[0] if e.args else ''
+                if isinstance(first_arg, str) and 'outbound_title' in first_arg:
+                    logger.warning("Discord API change detected when claiming gift %s", code)
                     # The API response structure might have changed, but we still want to track the attempt
-                    self.failed_codes[code] = "Discord API response format changed"
+                    self._remember(self.failed_codes, code, "Discord API response format changed", limit=MAX_FAILED_CODES)
                 else:
-                    logger.error(f"Unexpected error claiming gift {code}: {e}")
-                    self.failed_codes[code] = error_msg
-                self.update_stats("failed_redeem")
+                    logger.error("Unexpected error claiming gift %s: %s", code, e)
+                    self._remember(self.failed_codes, code, str(e), limit=MAX_FAILED_CODES)
+                self.failed_redeem += 1
 
-        # Check for server invites (no redundant enabled check as we already checked above)
-        invites = []
-        
-        # Check message content for invite links
-        invites.extend([match.group(1) for match in self.INVITE_PATTERN.finditer(message.content) 
-            if match.group(1)])
-            
-        # Check message embeds
-        for embed in message.embeds:
-            if embed.url:
-                if match := self.INVITE_PATTERN.search(embed.url):
-                    invites.append(match.group(1))
-        
         # Save unique invites to file
-        for invite in invites:
+        if invites:
+            await self._load_invites_async()
+        for invite in dict.fromkeys(invites):
             if invite:
                 self.save_invite(invite)
 
@@ -361,8 +454,9 @@ class NitroSniper(commands.Cog):
         if event_manager:
             event_manager.register_handler('on_message', self.__class__.__name__, self._handle_message)
             
-        # Start auto-reset task
+        # Start auto-reset and invite flush tasks
         self.auto_reset_stats.start()
+        self._flush_invites.start()
 
     async def cog_unload(self):
         """Cleanup when cog is unloaded"""
@@ -371,6 +465,9 @@ class NitroSniper(commands.Cog):
             event_manager.unregister_cog(self.__class__.__name__)
             
         self.auto_reset_stats.cancel()
+        self._flush_invites.cancel()
+        # Don't lose invites queued since the last flush
+        await self._write_pending_invites()
 
 async def setup(bot):
     await bot.add_cog(NitroSniper(bot))
@@ -1,7 +1,7 @@
 import discord
 from discord.ext import commands
 import logging
-from utils.general import format_message, quote_block
+from utils.general import format_message, quote_block, auto_delete_delay
 from utils.rate_limiter import rate_limiter
 
 logger = logging.getLogger(__name__)
@@ -9,6 +9,9 @@ logger = logging.getLogger(__name__)
 class Poll(commands.Cog):
     """A cog to vote on Discord polls"""
     
+    # Formatted by Route itself, which also picks out channel_id as the rate-limit bucket key
+    _VOTE_ROUTE_TEMPLATE = '/channels/{channel_id}/polls/{message_id}/answers/@me'
+    
     def __init__(self, bot):
         self.bot = bot
     
@@ -43,14 +46,15 @@ class Poll(commands.Cog):
                 payload = {"answer_ids": [answer_id]}
             
             # Use the bot's HTTP handler to make the PUT request
-            url = f'/channels/{channel_id}/polls/{message_id}/answers/@me'
+            request = self.bot.http.request
+            route = discord.http.Route(
+                'PUT', self._VOTE_ROUTE_TEMPLATE,
+                channel_id=channel_id, message_id=message_id
+            )
             
             # Make the PUT request
             try:
-                await self.bot.http.request(
-                    discord.http.Route('PUT', url), 
-                    json=payload
-                )
+                await request(route, json=payload)
                 
                 # # Send success message with auto-delete
                 # if answer_id == "0":
@@ -69,17 +73,17 @@ class Poll(commands.Cog):
                 error_message = f"Failed to vote: {e.status} {e.text}"
                 await ctx.send(
                     format_message(error_message),
-                    delete_after=self.bot.config_manager.auto_delete.delay if self.bot.config_manager.auto_delete.enabled else None
+                    delete_after=auto_delete_delay(self.bot)
                 )
-                logger.error(f"Poll vote error: {e}")
+                logger.error("Poll vote error: %s", e)
         
         except Exception as e:
             # Handle any other exceptions
             await ctx.send(
                 format_message(f"Error processing poll vote command: {str(e)}"),
-                delete_after=self.bot.config_manager.auto_delete.delay if self.bot.config_manager.auto_delete.enabled else None
+                delete_after=auto_delete_delay(self.bot)
             )
-            logger.error(f"Unexpected error in poll vote command: {e}")
+            logger.error("Unexpected error in poll vote command: %s", e)
 
 async def setup(bot):
     await bot.add_cog(Poll(bot))
@@ -1,22 +1,175 @@
 import discord
 from discord.ext import commands, tasks
 import time
-from utils.general import is_valid_emoji, format_message, quote_block
+from utils.general import is_emoji_char, format_message, quote_block, delete_in_background, auto_delete_delay
 import traceback
 import logging
 import asyncio
+import heapq
+import itertools
 import re
+from collections import OrderedDict
+from contextlib import suppress
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Optional
 
 logger = logging.getLogger(__name__)
 
+# Seconds to wait so bursts of presence updates collapse into one gateway send
+PRESENCE_DEBOUNCE = 0.25
+
+# Minimum seconds between presence sends; updates queued in between collapse into the latest
+PRESENCE_MIN_INTERVAL = 5
+
+# Most image URLs kept in the external asset cache
+MAX_ASSET_CACHE = 128
+
+# Longest the browser command waits for the gateway to come back after a switch
+BROWSER_RECONNECT_TIMEOUT = 10
+
+# Custom Discord emoji as typed in chat: <:name:id> or <a:name:id>
+_CUSTOM_EMOJI_RE = re.compile(r'<a?:(\w+):(\d+)>$')
+
+# Hex expiry timestamp carried in signed Discord CDN/media URLs
+_EX_RE = re.compile(r'ex=([0-9a-fA-F]+)')
+
+# Hosts whose URLs can be sent as mp: assets directly and need periodic refresh
+_DISCORD_CDN_PREFIXES = ('https://cdn.discordapp.com/', 'https://media.discordapp.net/')
+
+# Map string types to ActivityType enum
+ACTIVITY_TYPES = MappingProxyType({
+    'playing': discord.ActivityType.playing,      # 0
+    'streaming': discord.ActivityType.streaming,  # 1
+    'listening': discord.ActivityType.listening,  # 2
+    'watching': discord.ActivityType.watching,    # 3
+    'competing': discord.ActivityType.competing,  # 5
+    '0': discord.ActivityType.playing,
+    '1': discord.ActivityType.streaming,
+    '2': discord.ActivityType.listening,
+    '3': discord.ActivityType.watching,
+    '5': discord.ActivityType.competing
+})
+
+@dataclass(slots=True)
+class NormalizedPresence:
+    """Presence settings pre-parsed once per config write"""
+    status: discord.Status = discord.Status.dnd
+    activity_type: discord.ActivityType = discord.ActivityType.playing
+    is_streaming: bool = False
+    application_id: Optional[int] = None
+    app_id_key: Optional[str] = None  # application_id as stored, used to key application_assets
+    images: dict = field(default_factory=dict)  # large_image/small_image -> URL or asset name
+    activity_template: dict = field(default_factory=dict)  # static discord.Activity kwargs
+
+def _image_value(key, raw):
+    """Normalize a configured large/small image to a URL or asset name string."""
+    # If dict, extract the URL or asset name
+    if isinstance(raw, dict):
+        value = raw.get('url') or raw.get('name') or str(raw)
+    else:
+        value = raw
+
+    # Ensure value is a string
+    if not isinstance(value, str):
+        logger.error("Invalid %s type: %s - %s", key, type(value), value)
+        value = str(value)
+    return value
+
+def _cycle_from(parts, start):
+    """Endless iterator over rotation parts, beginning at position start"""
+    if len(parts) == 1:
+        return itertools.repeat(parts[0])
+    return itertools.islice(itertools.cycle(parts), start % len(parts), None)
+
+def _refreshed_url(item) -> str:
+    """Extract the URL string from one /attachments/refresh-urls response entry"""
+    if isinstance(item, dict):
+        return item.get('refreshed', item.get('original', str(item)))
+    return item if isinstance(item, str) else str(item)
+
+def _normalize_presence_config(cfg) -> NormalizedPresence:
+    """Parse the raw presence config into the typed values update_presence needs"""
+    activity_type = str(cfg.get('type', 'playing')).lower()
+    norm = NormalizedPresence(
+        status=getattr(discord.Status, str(cfg.get('status', 'dnd')).lower(), discord.Status.dnd),
+        activity_type=ACTIVITY_TYPES.get(activity_type, discord.ActivityType.playing),
+        is_streaming=activity_type in ('streaming', '1'),
+    )
+    if app_id := cfg.get('application_id'):
+        norm.app_id_key = app_id
+        try:
+            norm.application_id = int(app_id)
+        except (ValueError, TypeError):
+            logger.warning("Invalid application_id '%s', must be a valid integer. Skipping application_id.", app_id)
+    for key in ('large_image', 'small_image'):
+        if raw := cfg.get(key):
+            norm.images[key] = _image_value(key, raw)
+
+    template = norm.activity_template
+    template['type'] = norm.activity_type
+    if norm.application_id is not None:
+        template['application_id'] = norm.application_id
+
+    # Only add URL if type is streaming (either by name or number)
+    if norm.is_streaming and cfg.get('url'):
+        template['url'] = cfg['url']
+
+    # Handle buttons
+    buttons = []
+    if button1 := cfg.get('button1'):
+        buttons.append(button1)
+    if button2 := cfg.get('button2'):
+        buttons.append(button2)
+    if buttons:
+        template['buttons'] = buttons
+        template['application_id'] = template.get('application_id', '1')
+
+        # Add metadata with button URLs to make buttons clickable
+        button_urls = []
+        if url1 := cfg.get('url1'):
+            button_urls.append(url1)
+        elif len(buttons) > 0:
+            button_urls.append("")  # Empty placeholder if url1 not specified
+
+        if url2 := cfg.get('url2'):
+            button_urls.append(url2)
+        elif len(buttons) > 1:
+            button_urls.append("")  # Empty placeholder if url2 not specified
+
+        template['metadata'] = {
+            "button_urls": button_urls
+        }
+
+    # Add party info
+    if cfg.get('party_id') or (cfg.get('party_size') and cfg.get('party_max')):
+        party = {}
+        if party_id := cfg.get('party_id'):
+            party['id'] = party_id
+        if party_size := cfg.get('party_size'):
+            party['size'] = [int(party_size), int(cfg.get('party_max', party_size))]
+        template['party'] = party
+    return norm
+
 class Presence(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.application_assets = {}  # Change to store per application ID
-        self.external_asset_cache = {}  # Add this line
+        self.external_asset_cache = OrderedDict()  # url -> (mp asset path, ex= expiry or None), LRU
         self.rotation_task = None
+        self._rotation_reload = asyncio.Event()  # Set to make rotate_presence re-read its settings
+        self._initial_update_task = None
+        self._last_payload_key = None  # (status, activity dicts) last sent to the gateway
+        self._pending_presence = None  # (status, activities, payload_key) waiting to be sent
+        self._pending_send = None
+        self._last_presence_send = 0.0  # time.monotonic() of the last gateway send
+        self._presence_waiters = []  # futures of commands waiting for the pending presence to go out
+        self._norm_cfg = None  # NormalizedPresence for the config dict in _norm_src
+        self._norm_src = None
+        self._cached_emoji = None  # PartialEmoji for _cached_emoji_key (name, id)
+        self._cached_emoji_key = None
         self.session = None
-        self.discord_url_images = set()  # Track Discord CDN/media URLs for presence images
+        self._expiry_heap = []  # (ex_unix, url) min-heap of cached Discord URLs
 
     async def cog_load(self):
         """Register event handlers when cog is loaded"""
@@ -37,6 +190,9 @@ class Presence(commands.Cog):
         logger.debug("Initializing presence...")
         if self.bot.is_closed():
             return
+
+        # A fresh session has no presence yet, so the next update must be sent
+        self._last_payload_key = None
         
         # Cancel existing task first
         if self.rotation_task and not self.rotation_task.done():
@@ -46,9 +202,7 @@ class Presence(commands.Cog):
             except asyncio.CancelledError:
                 pass
         
-        # Load config
-        config = self.load_config()
-        presence_config = config.get('presence', {})
+        presence_config = self._presence_cfg
         rotation_settings = presence_config.get('rotation', {})
         
         # Check if presence and rotation are enabled
@@ -58,8 +212,12 @@ class Presence(commands.Cog):
                 self.rotation_task = asyncio.create_task(self.rotate_presence())
                 logger.debug("Started presence rotation task")
         else:
-            # Just update regular presence if rotation is disabled
-            await self.update_presence()
+            # Just update regular presence if rotation is disabled, without blocking on_ready
+            if self._initial_update_task and not self._initial_update_task.done():
+                self._initial_update_task.cancel()
+            self._initial_update_task = asyncio.create_task(
+                self.update_presence(), name='presence-initial-update'
+            )
         
     async def fetch_application_assets(self, application_id: str):
         """Fetch assets for the application using discord.py-self's HTTP handler"""
@@ -74,27 +232,23 @@ class Presence(commands.Cog):
                 asset['name']: asset['id'] 
                 for asset in assets
             }
-            logger.info(f"Fetched {len(self.application_assets[application_id])} assets for app {application_id}")
+            logger.info("Fetched %s assets for app %s", len(self.application_assets[application_id]), application_id)
             return True
             
         except discord.HTTPException as e:
-            logger.error(f"Failed to fetch assets: {e}")
+            logger.error("Failed to fetch assets: %s", e)
         except Exception as e:
-            logger.error(f"Error fetching application assets: {e}")
+            logger.error("Error fetching application assets: %s", e)
         return False
 
     async def register_external_asset(self, image_url: str) -> str:
-        """Register external asset using discord.py-self's HTTP handler, with Discord CDN/media URL support and refresh tracking."""
+        """Register external asset using discord.py-self's HTTP handler, with Discord CDN/media URL support."""
         try:
-            # Check if it's a Discord CDN/media URL - convert directly to mp: format and track for refresh
-            if image_url.startswith('https://cdn.discordapp.com/') or image_url.startswith('https://media.discordapp.net/'):
-                self.discord_url_images.add(image_url)
+            # Check if it's a Discord CDN/media URL - convert directly to mp: format
+            if image_url.startswith(_DISCORD_CDN_PREFIXES):
                 # strip the base and return the remaining path with mp: prefix
-                if image_url.startswith('https://cdn.discordapp.com/'):
-                    image_url = image_url.replace('https://cdn.discordapp.com/', '')
-                else:
-                    image_url = image_url.replace('https://media.discordapp.net/', '')
-                return f"mp:{image_url}"
+                prefix = next(p for p in _DISCORD_CDN_PREFIXES if image_url.startswith(p))
+                return f"mp:{image_url.removeprefix(prefix)}"
             # For other URLs, use external asset registration
             app_id = self.bot.config_manager.presence.get('application_id') if self.bot.config_manager.presence else None
             data = await self.bot.http.request(
@@ -105,128 +259,118 @@ class Presence(commands.Cog):
                 return f"mp:{data[0]['external_asset_path']}"
             logger.error("Empty response when registering external asset")
         except discord.HTTPException as e:
-            logger.error(f"Failed to register external asset: {e}")
+            logger.error("Failed to register external asset: %s", e)
         except Exception as e:
-            logger.error(f"Error registering external asset: {e}")
+            logger.error("Error registering external asset: %s", e)
         return None
 
-    def is_discord_url_expired(self, url: str, offset_hours: int = 3) -> bool:
+    def is_discord_url_expired(self, url: str, offset_hours: int = 3, now: int = None) -> bool:
         """Check if a Discord CDN/media URL is expired based on ex= hex timestamp."""
-        match = re.search(r'ex=([0-9a-fA-F]+)', url)
-        if match:
-            ex_hex = match.group(1)
-            try:
-                ex_unix = int(ex_hex, 16)
-                now = int(time.time())
-                # Offset: expire 3 hours before actual expiration
-                offset = offset_hours * 3600
-                return now > (ex_unix - offset)
-            except Exception:
-                return False
-        return False
+        match = _EX_RE.search(url)
+        if not match:
+            return False
+        if now is None:
+            now = int(time.time())
+        # Offset: treat the URL as expired offset_hours before actual expiration
+        return int(match.group(1), 16) - offset_hours * 3600 < now
+
+    def _cache_asset(self, url: str, asset):
+        """Cache the registered asset for url, scheduling Discord URLs by their ex= expiry."""
+        expires = None
+        # Only Discord CDN/media URLs go to the refresh endpoint; other hosts may use ex= too
+        if url.startswith(_DISCORD_CDN_PREFIXES) and (match := _EX_RE.search(url)):
+            expires = int(match.group(1), 16)
+            heapq.heappush(self._expiry_heap, (expires, url))
+        cache = self.external_asset_cache
+        cache[url] = (asset, expires)
+        cache.move_to_end(url)
+        if len(cache) > MAX_ASSET_CACHE:
+            cache.popitem(last=False)
+        # Drop heap entries left behind by evicted or replaced URLs
+        if len(self._expiry_heap) > 2 * MAX_ASSET_CACHE:
+            self._expiry_heap = [(exp, key) for key, (_, exp) in cache.items() if exp is not None]
+            heapq.heapify(self._expiry_heap)
+        return asset
 
     @tasks.loop(hours=2)
     async def refresh_discord_urls_periodically(self):
         """Background task to refresh Discord CDN/media URLs every 2 hours."""
         try:
-            if self.discord_url_images:
-                # Filter to only Discord CDN/media URLs that need refreshing
-                urls_to_refresh = []
-                for url in list(self.discord_url_images):
-                    # Only process Discord CDN/media URLs
-                    if (url.startswith('https://cdn.discordapp.com/') or 
-                        url.startswith('https://media.discordapp.net/')) and \
-                       self.is_discord_url_expired(url, offset_hours=3):
-                        urls_to_refresh.append(url)
-                        
+            if self._expiry_heap:
+                # Pop only the URLs due within the next 3 hours
+                now = int(time.time())
+                threshold = now + 3 * 3600
+                due = {}  # insertion-ordered set; a URL can sit in the heap more than once
+                while self._expiry_heap and self._expiry_heap[0][0] <= threshold:
+                    expires, url = heapq.heappop(self._expiry_heap)
+                    entry = self.external_asset_cache.get(url)
+                    # Skip entries for URLs that were already replaced
+                    if entry is not None and entry[1] == expires:
+                        due[url] = None
+                urls_to_refresh = [*due]
+
                 if urls_to_refresh:
-                    logger.info(f"Refreshing {len(urls_to_refresh)} Discord CDN/media URLs...")
+                    logger.info("Refreshing %s Discord CDN/media URLs...", len(urls_to_refresh))
                     # Send POST request to refresh URLs
                     refreshed = await self.refresh_discord_urls(urls_to_refresh)
-                    
-                    # Check if refresh was successful
-                    if refreshed != urls_to_refresh:
-                        # Update the set with new URLs
-                        for old_url, new_url in zip(urls_to_refresh, refreshed):
-                            # Handle case where new_url might be a dict from API response
-                            if isinstance(new_url, dict):
-                                new_url = new_url.get('refreshed', new_url.get('original', str(new_url)))
-                            elif not isinstance(new_url, str):
-                                new_url = str(new_url)
-                                
-                            if old_url != new_url:  # Only update if actually refreshed
-                                self.discord_url_images.discard(old_url)
-                                self.discord_url_images.add(new_url)
-                                
-                                # Update cache entries that use this URL
-                                cache_keys_to_update = []
-                                for cache_key in list(self.external_asset_cache.keys()):
-                                    if old_url == cache_key:
-                                        cache_keys_to_update.append(cache_key)
-                                
-                                for cache_key in cache_keys_to_update:
-                                    # Remove old cache entry and add new one
-                                    del self.external_asset_cache[cache_key]
-                                    self.external_asset_cache[new_url] = await self.register_external_asset(new_url)
-                                    logger.debug(f"Updated cache: {cache_key} -> {new_url}")
-                    else:
-                        logger.warning(f"Failed to refresh {len(urls_to_refresh)} URLs - using original URLs")
-                
-                # Clean up expired cache entries (only Discord URLs)
-                await self.cleanup_expired_cache()
-                
+
+                    replaced = []
+                    for old_url, new_url in zip(urls_to_refresh, refreshed):
+                        if old_url != new_url:  # Only update if actually refreshed
+                            # Remove old cache entry; the new one is registered below
+                            self.external_asset_cache.pop(old_url, None)
+                            replaced.append(new_url)
+                            logger.debug("Updated cache: %s -> %s", old_url, new_url)
+                        elif self.is_discord_url_expired(old_url, offset_hours=1, now=now):
+                            # Too close to expiry to keep serving - drop it
+                            self.external_asset_cache.pop(old_url, None)
+                            logger.debug("Removed expired cache entry: %s", old_url)
+                        elif (entry := self.external_asset_cache.get(old_url)) is not None:
+                            # Not refreshed - keep it scheduled for the next tick
+                            heapq.heappush(self._expiry_heap, (entry[1], old_url))
+
+                    # Register all refreshed URLs concurrently
+                    assets = await asyncio.gather(*(self.register_external_asset(url) for url in replaced))
+                    for url, asset in zip(replaced, assets):
+                        self._cache_asset(url, asset)
+
         except Exception as e:
-            logger.error(f"Error in refresh_discord_urls_periodically: {e}")
+            logger.error("Error in refresh_discord_urls_periodically: %s", e)
 
     async def refresh_discord_urls(self, urls):
-        """Send POST to Discord API to refresh CDN/media URLs."""
+        """Send POST to Discord API to refresh CDN/media URLs; always returns a list of URL strings."""
         try:
             response = await self.bot.http.request(
                 discord.http.Route('POST', '/attachments/refresh-urls'),
                 json={"attachment_urls": urls}
             )
-            refreshed_urls = response.get('refreshed_urls', [])
+            # Handle Discord API response format: entries may be dicts or plain URLs
+            refreshed_urls = [_refreshed_url(item) for item in response.get('refreshed_urls', [])]
             
             # Validate that we got the expected number of URLs back
             if len(refreshed_urls) != len(urls):
-                logger.warning(f"Expected {len(urls)} refreshed URLs, got {len(refreshed_urls)}")
+                logger.warning("Expected %s refreshed URLs, got %s", len(urls), len(refreshed_urls))
                 # Pad with original URLs if needed
-                while len(refreshed_urls) < len(urls):
-                    refreshed_urls.append(urls[len(refreshed_urls)])
+                if len(refreshed_urls) < len(urls):
+                    refreshed_urls.extend(urls[len(refreshed_urls):])
             
             # Log successful refreshes
-            successful_refreshes = sum(1 for old, new in zip(urls, refreshed_urls) if old != new)
+            successful_refreshes = sum(old != new for old, new in zip(urls, refreshed_urls))
             if successful_refreshes > 0:
-                logger.info(f"Successfully refreshed {successful_refreshes}/{len(urls)} URLs")
+                logger.info("Successfully refreshed %s/%s URLs", successful_refreshes, len(urls))
             
             return refreshed_urls
         except Exception as e:
-            logger.error(f"Error refreshing Discord URLs: {e}")
+            logger.error("Error refreshing Discord URLs: %s", e)
             return urls
 
-    async def cleanup_expired_cache(self):
-        """Remove expired Discord CDN/media URLs from external asset cache."""
-        try:
-            expired_keys = []
-            for url in list(self.external_asset_cache.keys()):
-                # Only clean up Discord CDN/media URLs
-                if ((url.startswith('https://cdn.discordapp.com/') or 
-                     url.startswith('https://media.discordapp.net/')) and
-                    self.is_discord_url_expired(url, offset_hours=1)):  # More aggressive cleanup
-                    expired_keys.append(url)
-            
-            for key in expired_keys:
-                del self.external_asset_cache[key]
-                logger.debug(f"Removed expired cache entry: {key}")
-            
-            if expired_keys:
-                logger.info(f"Cleaned up {len(expired_keys)} expired cache entries")
-        except Exception as e:
-            logger.error(f"Error cleaning up cache: {e}")
+    @property
+    def _presence_cfg(self):
+        """This token's presence settings, read straight from the config manager"""
+        return self.bot.config_manager.presence or {}
 
     def load_config(self):
-        config = {'presence': self.bot.config_manager.presence if self.bot.config_manager.presence else {}}
-        return config
+        return {'presence': self._presence_cfg}
     
     async def save_config(self, config):
         """Save config file"""
@@ -236,42 +380,65 @@ class Presence(commands.Cog):
                 self.bot.config_manager.presence = {}
             self.bot.config_manager.presence = config['presence']
             await self.bot.config_manager.save_config_async()
+            self._refresh_normalized()
         except Exception as e:
             logger.error("Error saving config: %s", e)
 
+    def _refresh_normalized(self):
+        """Re-parse the presence config after it was edited"""
+        self._norm_cfg = None
+        self._norm_src = self._presence_cfg
+        self._norm_cfg = _normalize_presence_config(self._norm_src)
+        return self._norm_cfg
+
+    def _normalized(self):
+        """Parsed presence config, rebuilt if the config dict was swapped out"""
+        if self._norm_cfg is None or self._presence_cfg is not self._norm_src:
+            return self._refresh_normalized()
+        return self._norm_cfg
+
     def is_enabled(self):
         """Check if rich presence is enabled"""
-        config = self.load_config()
-        if not config or 'presence' not in config:
-            return False
-        return config['presence'].get('enabled', False)
-
-    # Map string types to ActivityType enum
-    ACTIVITY_TYPES = {
-        'playing': discord.ActivityType.playing,      # 0
-        'streaming': discord.ActivityType.streaming,  # 1
-        'listening': discord.ActivityType.listening,  # 2
-        'watching': discord.ActivityType.watching,    # 3
-        'competing': discord.ActivityType.competing,  # 5
-        '0': discord.ActivityType.playing,
-        '1': discord.ActivityType.streaming,
-        '2': discord.ActivityType.listening,
-        '3': discord.ActivityType.watching,
-        '5': discord.ActivityType.competing
-    }
+        return bool(self._presence_cfg.get('enabled'))
+
+    async def _resolve_image_asset(self, value, app_assets, refreshed_map):
+        """Turn an image URL or asset name into the asset key sent with the activity.
+
+        refreshed_map holds the results of this update's batched URL refresh."""
+        if not value.startswith(('http://', 'https://')):
+            return app_assets.get(value, value)
+
+        if value in refreshed_map:
+            new_url = refreshed_map[value]
+            if new_url != value:
+                # Remove old cache entry if URL changed
+                self.external_asset_cache.pop(value, None)
+                value = new_url
+        elif (entry := self.external_asset_cache.get(value)) is not None:
+            self.external_asset_cache.move_to_end(value)
+            return entry[0]
+        return self._cache_asset(value, await self.register_external_asset(value))
 
-    async def update_presence(self, status=None, name=None, state=None, details=None, custom_status=None):
+    def _partial_emoji(self, emoji_data):
+        """PartialEmoji for a stored custom status emoji, reused while it stays the same"""
+        key = (emoji_data.get('name'), emoji_data.get('id'))
+        if key != self._cached_emoji_key:
+            self._cached_emoji = discord.PartialEmoji(name=key[0], id=key[1])
+            self._cached_emoji_key = key
+        return self._cached_emoji
+
+    async def update_presence(self, status=None, name=None, state=None, details=None, custom_status=None, wait=False):
+        """Queue a presence update; with wait=True, return once it (or a newer update) has been sent"""
         try:
             # check if bot is closed or disconnected
             if self.bot.is_closed() or not self.bot.is_ready():
                 return
 
-            config = self.load_config()
-            presence_config = config.get('presence', {})
+            presence_config = self._presence_cfg
+            norm = self._normalized()
             
             # Determine status
-            status_value = status.name.lower() if status else presence_config.get('status', 'dnd').lower()
-            status = getattr(discord.Status, status_value, discord.Status.dnd)
+            status = status or norm.status
             
             activities = []
 
@@ -291,101 +458,40 @@ class Presence(commands.Cog):
                 state = state or presence_config.get('state', '')
                 details = details or presence_config.get('details', '')
 
+                # Static fields (type, application, buttons, party) come prebuilt from the config
+                activity_kwargs = norm.activity_template.copy()
+                activity_kwargs.update(
+                    name=name,
+                    state=state,
+                    details=details if not norm.is_streaming else None,
+                )
+                if 'buttons' in activity_kwargs:
+                    activity_kwargs['session_id'] = self.bot.ws.session_id
 
-                activity_type = str(presence_config.get('type', 'playing')).lower()
-                activity_kwargs = {
-                    'type': self.ACTIVITY_TYPES.get(activity_type.lower()) or self.ACTIVITY_TYPES.get(activity_type) or discord.ActivityType.playing,
-                    'name': name,
-                    'state': state,
-                    'details': details if activity_type not in ['streaming', '1'] else None,
-                }
-
-                if app_id := presence_config.get('application_id'):
-                    try:
-                        activity_kwargs['application_id'] = int(app_id)
-                        if app_id not in self.application_assets:
-                            await self.fetch_application_assets(app_id)
-                    except (ValueError, TypeError):
-                        logger.warning(f"Invalid application_id '{app_id}', must be a valid integer. Skipping application_id.")
-
-                # Only add URL if type is streaming (either by name or number)
-                if (activity_type == 'streaming' or activity_type == '1') and presence_config.get('url'):
-                    activity_kwargs['url'] = presence_config['url']
+                fetch_task = None
+                if norm.application_id is not None and norm.app_id_key not in self.application_assets:
+                    # Fetch in the background while image URLs are refreshed
+                    fetch_task = asyncio.create_task(self.fetch_application_assets(norm.app_id_key))
     
                 # Handle assets
                 assets = {}
-                app_assets = self.application_assets.get(app_id, {})
-
-                # Handle large image
-                if large_image := presence_config.get('large_image'):
-                    # If dict, extract the URL or asset name
-                    if isinstance(large_image, dict):
-                        large_image_val = large_image.get('url') or large_image.get('name') or str(large_image)
-                    else:
-                        large_image_val = large_image
-                    
-                    # Ensure large_image_val is a string
-                    if not isinstance(large_image_val, str):
-                        logger.error(f"Invalid large_image_val type: {type(large_image_val)} - {large_image_val}")
-                        large_image_val = str(large_image_val)
-                    
-                    if large_image_val.startswith(('http://', 'https://')):
-                        # Check cache first, refresh if expired
-                        if large_image_val not in self.external_asset_cache or self.is_discord_url_expired(large_image_val, offset_hours=3):
-                            if self.is_discord_url_expired(large_image_val, offset_hours=3):
-                                refreshed = await self.refresh_discord_urls([large_image_val])
-                                if refreshed and len(refreshed) > 0:
-                                    new_url = refreshed[0]
-                                    # Handle Discord API response format
-                                    if isinstance(new_url, dict):
-                                        logger.debug(f"API returned refresh dict: {new_url}")
-                                        new_url = new_url.get('refreshed', new_url.get('original', str(new_url)))
-                                    elif not isinstance(new_url, str):
-                                        new_url = str(new_url)
-                                    
-                                    if new_url != large_image_val:
-                                        # Remove old cache entry if URL changed
-                                        self.external_asset_cache.pop(large_image_val, None)
-                                        large_image_val = new_url
-                            self.external_asset_cache[large_image_val] = await self.register_external_asset(large_image_val)
-                        assets['large_image'] = self.external_asset_cache[large_image_val]
-                    else:
-                        assets['large_image'] = app_assets.get(large_image_val, large_image_val)
-
-                # Handle small image 
-                if small_image := presence_config.get('small_image'):
-                    if isinstance(small_image, dict):
-                        small_image_val = small_image.get('url') or small_image.get('name') or str(small_image)
-                    else:
-                        small_image_val = small_image
-                    
-                    # Ensure small_image_val is a string
-                    if not isinstance(small_image_val, str):
-                        logger.error(f"Invalid small_image_val type: {type(small_image_val)} - {small_image_val}")
-                        small_image_val = str(small_image_val)
-                    
-                    if small_image_val.startswith(('http://', 'https://')):
-                        # Check cache first, refresh if expired
-                        if small_image_val not in self.external_asset_cache or self.is_discord_url_expired(small_image_val, offset_hours=3):
-                            if self.is_discord_url_expired(small_image_val, offset_hours=3):
-                                refreshed = await self.refresh_discord_urls([small_image_val])
-                                if refreshed and len(refreshed) > 0:
-                                    new_url = refreshed[0]
-                                    # Handle Discord API response format
-                                    if isinstance(new_url, dict):
-                                        logger.debug(f"API returned refresh dict: {new_url}")
-                                        new_url = new_url.get('refreshed', new_url.get('original', str(new_url)))
-                                    elif not isinstance(new_url, str):
-                                        new_url = str(new_url)
-                                    
-                                    if new_url != small_image_val:
-                                        # Remove old cache entry if URL changed
-                                        self.external_asset_cache.pop(small_image_val, None)
-                                        small_image_val = new_url
-                            self.external_asset_cache[small_image_val] = await self.register_external_asset(small_image_val)
-                        assets['small_image'] = self.external_asset_cache[small_image_val]
-                    else:
-                        assets['small_image'] = app_assets.get(small_image_val, small_image_val)
+                images = norm.images
+
+                # Refresh every expired image URL in a single request
+                now = int(time.time())
+                expired = [
+                    url for url in dict.fromkeys(images.values())
+                    if url.startswith(('http://', 'https://'))
+                    and self.is_discord_url_expired(url, offset_hours=3, now=now)
+                ]
+                refreshed_map = dict(zip(expired, await self.refresh_discord_urls(expired))) if expired else {}
+
+                if fetch_task:
+                    await fetch_task
+                app_assets = self.application_assets.get(norm.app_id_key, {})
+
+                for key, value in images.items():
+                    assets[key] = await self._resolve_image_asset(value, app_assets, refreshed_map)
 
                 if assets:
                     activity_kwargs['assets'] = assets
@@ -394,42 +500,6 @@ class Presence(commands.Cog):
                 if self.bot.start_time:
                     activity_kwargs['timestamps'] = {'start': int(self.bot.start_time * 1000)}
     
-                # Handle buttons
-                buttons = []
-                if button1 := presence_config.get('button1'):
-                    buttons.append(button1)
-                if button2 := presence_config.get('button2'):
-                    buttons.append(button2)
-                if buttons:
-                    activity_kwargs['buttons'] = buttons
-                    activity_kwargs['session_id'] = self.bot.ws.session_id
-                    activity_kwargs["application_id"] = activity_kwargs.get("application_id", "1")
-                    
-                    # Add metadata with button URLs to make buttons clickable
-                    button_urls = []
-                    if url1 := presence_config.get('url1'):
-                        button_urls.append(url1)
-                    elif len(buttons) > 0:
-                        button_urls.append("")  # Empty placeholder if url1 not specified
-                        
-                    if url2 := presence_config.get('url2'):
-                        button_urls.append(url2)
-                    elif len(buttons) > 1:
-                        button_urls.append("")  # Empty placeholder if url2 not specified
-                        
-                    activity_kwargs['metadata'] = {
-                        "button_urls": button_urls
-                    }
-    
-                # Add party info
-                if presence_config.get('party_id') or (presence_config.get('party_size') and presence_config.get('party_max')):
-                    party = {}
-                    if party_id := presence_config.get('party_id'):
-                        party['id'] = party_id
-                    if party_size := presence_config.get('party_size'):
-                        party['size'] = [int(party_size), int(presence_config.get('party_max', party_size))]
-                    activity_kwargs['party'] = party
-    
                 activities.append(discord.Activity(**activity_kwargs))
     
             # set the custom status if configured whether it has just text or an emoji or both
@@ -437,23 +507,60 @@ class Presence(commands.Cog):
             if custom_status_data:
                 emoji = None
                 if emoji_data := custom_status_data.get('emoji'):
-                    emoji = discord.PartialEmoji(name=emoji_data.get('name'), id=emoji_data.get('id'))
+                    emoji = self._partial_emoji(emoji_data)
                 activities.append(discord.CustomActivity(
                     name=custom_status_data.get('text', ''),
                     emoji=emoji
                 ))
-            try:
-                # Update presence with all activities
-                await self.bot.change_presence(status=status, activities=activities, afk=True)
-            except (discord.HTTPException, discord.GatewayNotFound, discord.ConnectionClosed, discord.ClientException) as e:
-                # log but don't raise - connection issues are expected sometimes
-                logger.error(f"Connection error updating presence: {e}")
+            # Skip the gateway send if nothing changed since the last update
+            payload_key = (status, [activity.to_dict() for activity in activities])
+            if self._pending_presence is None and payload_key == self._last_payload_key:
                 return
+            # Queue it; bursts of updates inside the debounce window collapse into one send
+            self._pending_presence = (status, activities, payload_key)
+            if self._pending_send is None or self._pending_send.done():
+                self._pending_send = asyncio.create_task(self._flush_presence())
+            if wait:
+                # Resolved when this payload, or a newer one replacing it, has been sent
+                waiter = asyncio.get_running_loop().create_future()
+                self._presence_waiters.append(waiter)
+                await waiter
 
-    
         except Exception as e:
-            logger.error(f"Error updating presence: {e}")
-            logger.debug("".join(traceback.format_exc()))
+            logger.error("Error updating presence: %s", e)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("".join(traceback.format_exc()))
+
+    async def _flush_presence(self):
+        """Send the latest queued presence once the debounce window and rate spacing allow"""
+        while self._pending_presence is not None:
+            # Debounce, and keep sends at least PRESENCE_MIN_INTERVAL apart
+            next_allowed = self._last_presence_send + PRESENCE_MIN_INTERVAL - time.monotonic()
+            await asyncio.sleep(max(PRESENCE_DEBOUNCE, next_allowed))
+            await self._send_pending_presence()
+
+    async def _send_pending_presence(self):
+        """Send the queued presence right away, if it differs from the last one sent"""
+        if self._pending_presence is None:
+            return
+        status, activities, payload_key = self._pending_presence
+        self._pending_presence = None
+        waiters, self._presence_waiters = self._presence_waiters, []
+        try:
+            if payload_key != self._last_payload_key:
+                # Update presence with all activities
+                self._last_presence_send = time.monotonic()
+                await self.bot.change_presence(status=status, activities=activities, afk=True)
+                self._last_payload_key = payload_key
+        except (discord.HTTPException, discord.GatewayNotFound, discord.ConnectionClosed, discord.ClientException) as e:
+            # log but don't raise - connection issues are expected sometimes
+            logger.error("Connection error updating presence: %s", e)
+        except Exception as e:
+            logger.error("Error updating presence: %s", e)
+        finally:
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.set_result(None)
 
     @commands.command(aliases=['rp'])
     async def presence(self, ctx, setting=None, *, value=None):
@@ -461,20 +568,17 @@ class Presence(commands.Cog):
         presence true - Enable/disable
         presence name Game - Set activity name
         presence type streaming - Set activity type"""
-        try:await ctx.message.delete()
-        except:pass
+        delete_in_background(ctx.message)
+
+        delete_after = auto_delete_delay(self.bot)
 
         config = self.load_config()
-        if not config:
-            config = {}
-        if 'presence' not in config:
-            config['presence'] = {}
-        presence_config = config['presence']
+        presence_config = config.setdefault('presence', {})
 
         if not setting:
             await ctx.send(
                 format_message("Please specify a setting to modify"),
-                delete_after=self.bot.config_manager.auto_delete.delay if self.bot.config_manager.auto_delete.enabled else None
+                delete_after=delete_after
             )
             return
 
@@ -486,7 +590,7 @@ class Presence(commands.Cog):
                 state_word = "enabled" if new_state else "disabled"
                 await ctx.send(
                     format_message(f"Presence is already {state_word}"),
-                    delete_after=self.bot.config_manager.auto_delete.delay if self.bot.config_manager.auto_delete.enabled else None
+                    delete_after=delete_after
                 )
                 return
                 
@@ -503,11 +607,11 @@ class Presence(commands.Cog):
             await self.save_config(config)
             if presence_config['enabled']:
                 self.start_time = int(time.time())
-            await self.update_presence()
+            await self.update_presence(wait=True)
             msg = "Presence enabled" if presence_config['enabled'] else "Presence disabled"
             await ctx.send(
                 format_message(msg),
-                delete_after=self.bot.config_manager.auto_delete.delay if self.bot.config_manager.auto_delete.enabled else None
+                delete_after=delete_after
             )
             return
 
@@ -522,7 +626,7 @@ class Presence(commands.Cog):
             msg = f"Invalid setting. Valid settings are: {', '.join(valid_settings)}"
             await ctx.send(
                 format_message(msg),
-                delete_after=self.bot.config_manager.auto_delete.delay if self.bot.config_manager.auto_delete.enabled else None
+                delete_after=delete_after
             )
             return
 
@@ -531,7 +635,7 @@ class Presence(commands.Cog):
             if value and not value.startswith(('http://', 'https://')):
                 await ctx.send(
                     format_message("Invalid URL. Must start with http:// or https://"),
-                    delete_after=self.bot.config_manager.auto_delete.delay if self.bot.config_manager.auto_delete.enabled else None
+                    delete_after=delete_after
                 )
                 return
 
@@ -541,23 +645,30 @@ class Presence(commands.Cog):
             if setting in presence_config:
                 del presence_config[setting]
                 await self.save_config(config)
-                await self.update_presence()
+                await self.update_presence(wait=True)
                 await ctx.send(
                     format_message(f"Cleared {setting} value"),
-                    delete_after=self.bot.config_manager.auto_delete.delay if self.bot.config_manager.auto_delete.enabled else None
+                    delete_after=delete_after
                 )
                 return
             else:
                 await ctx.send(
                     format_message(f"{setting} was already empty."),
-                    delete_after=self.bot.config_manager.auto_delete.delay if self.bot.config_manager.auto_delete.enabled else None
+                    delete_after=delete_after
                 )
                 return
 
         if not value:
             await ctx.send(
                 format_message("Please provide a value"),
-                delete_after=self.bot.config_manager.auto_delete.delay if self.bot.config_manager.auto_delete.enabled else None
+                delete_after=delete_after
+            )
+            return
+
+        if presence_config.get(setting) == value:
+            await ctx.send(
+                format_message(f"{setting} is already set to: {value}"),
+                delete_after=delete_after
             )
             return
 
@@ -576,47 +687,49 @@ class Presence(commands.Cog):
                                 f"'{value}' is not a valid asset name or URL! Available assets: {available_assets}\n"
                                 "You can also use direct image URLs starting with http:// or https://"
                             ),
-                            delete_after=self.bot.config_manager.auto_delete.delay if self.bot.config_manager.auto_delete.enabled else None
+                            delete_after=delete_after
                         )
                         return
                 # Only validate URL format if no application ID
                 elif not value.startswith(('http://', 'https://')):
                     await ctx.send(
                         format_message("Please provide a direct image URL starting with http:// or https://"),
-                        delete_after=self.bot.config_manager.auto_delete.delay if self.bot.config_manager.auto_delete.enabled else None
+                        delete_after=delete_after
                     )
                     return
                 # tell the user to set the application ID if they want to use assets
                 elif not presence_config.get('application_id'):
                     await ctx.send(
                         format_message("Cannot use assets without an application ID. Set the application ID first!"),
-                        delete_after=self.bot.config_manager.auto_delete.delay if self.bot.config_manager.auto_delete.enabled else None
+                        delete_after=delete_after
                     )
                     return
 
-            presence_config[setting] = value
-            await self.save_config(config)
-
         presence_config[setting] = value
         await self.save_config(config)
         
         # Check if rotation is enabled 
         rotation_settings = presence_config.get('rotation', {})
         if rotation_settings.get('enabled', False):
-            # Restart the rotation task to pick up new settings
-            if self.rotation_task and not self.rotation_task.done():
-                self.rotation_task.cancel()
-            self.rotation_task = asyncio.create_task(self.rotate_presence())
+            # Let the rotation task pick up the new settings
+            self._reload_rotation()
         else:
             # Update regular presence if rotation disabled
-            await self.update_presence()
+            await self.update_presence(wait=True)
 
         msg = f"Updated {setting} to: {value}"
         await ctx.send(
             format_message(msg),
-            delete_after=self.bot.config_manager.auto_delete.delay if self.bot.config_manager.auto_delete.enabled else None
+            delete_after=delete_after
         )
 
+    def _reload_rotation(self):
+        """Signal the running rotation task to re-read settings, starting it if needed"""
+        if self.rotation_task and not self.rotation_task.done():
+            self._rotation_reload.set()
+        else:
+            self.rotation_task = asyncio.create_task(self.rotate_presence())
+
     async def rotate_presence(self):
         """
         Rotates through different presence settings at specified intervals.
@@ -634,62 +747,61 @@ class Presence(commands.Cog):
         Each rotatable field cycles independently from others at the same interval.
         """
         try:
-            name_index = 0
-            state_index = 0
-            details_index = 0
-            custom_status_index = 0
-
-            # Load config once and reuse
-            config = self.load_config()
-            presence = config.get('presence', {})
-            rotation_settings = presence.get('rotation', {}) 
-            # get the custom status if it exists
-            custom_status = presence.get('custom_status', {})
-            # get the text from the custom status if it exists
-            custom_status_text = custom_status.get('text', '')
-            # get emoji if it exists
-            emoji_data = custom_status.get('emoji', {})
-            emoji = None
-            if emoji_data:
-                emoji = discord.PartialEmoji(name=emoji_data.get('name'), id=emoji_data.get('id'))
-            # Cache the split parts
-            # Split only if contains period
-            name_parts = presence.get('name', '').split('.') if '.' in presence.get('name', '') else [presence.get('name', '')]
-            state_parts = presence.get('state', '').split('.') if '.' in presence.get('state', '') else [presence.get('state', '')]
-            details_parts = presence.get('details', '').split('.') if '.' in presence.get('details', '') else [presence.get('details', '')]
-            custom_status_parts = custom_status_text.split('.') if '.' in custom_status_text else [custom_status_text]
-            rotation_delay = rotation_settings.get('delay', 60)
-            
-            # Rotate through cached parts
-            while rotation_settings.get('enabled', False):
-                current_name = name_parts[name_index % len(name_parts)] if len(name_parts) > 1 else name_parts[0]
-                current_state = state_parts[state_index % len(state_parts)] if len(state_parts) > 1 else state_parts[0]
-                current_details = details_parts[details_index % len(details_parts)] if len(details_parts) > 1 else details_parts[0]
-                current_custom_status = custom_status_parts[custom_status_index % len(custom_status_parts)] if len(custom_status_parts) > 1 else custom_status_parts[0]
-
-                # create the custom status object
-                custom_status_data = {
-                    'text': current_custom_status,
-                    'emoji': emoji_data if emoji else None
-                }
-                
-                await self.update_presence(name=current_name, state=current_state, details=current_details, custom_status=custom_status_data)
-                # Only increment if there are multiple parts to rotate through
-                if len(name_parts) > 1:
-                    name_index += 1
-                if len(state_parts) > 1:    
-                    state_index += 1
-                if len(details_parts) > 1:
-                    details_index += 1
-                if len(custom_status_parts) > 1:
-                    custom_status_index += 1
-                await asyncio.sleep(rotation_delay)
+            tick = 0  # Rotations done so far; kept across settings reloads
+            self._rotation_reload.clear()
+
+            while True:
+                presence = self._presence_cfg
+                rotation_settings = presence.get('rotation', {}) 
+                # get the custom status if it exists
+                custom_status = presence.get('custom_status', {})
+                # get the text from the custom status if it exists
+                custom_status_text = custom_status.get('text', '')
+                # get emoji if it exists
+                emoji_data = custom_status.get('emoji', {})
+                # Cache the split parts (split returns [value] when there is no period)
+                name_parts = presence.get('name', '').split('.')
+                state_parts = presence.get('state', '').split('.')
+                details_parts = presence.get('details', '').split('.')
+                custom_status_parts = custom_status_text.split('.')
+                rotation_delay = rotation_settings.get('delay', 60)
+
+                name_iter = _cycle_from(name_parts, tick)
+                state_iter = _cycle_from(state_parts, tick)
+                details_iter = _cycle_from(details_parts, tick)
+                custom_status_iter = _cycle_from(custom_status_parts, tick)
                 
-                # Periodically check if settings changed
-                if name_index or state_index or details_index % 10 == 0:  # Check every 10 rotations
-                    config = self.load_config()
-                    rotation_settings = config.get('presence', {}).get('rotation', {})
-                        
+                # Commands that change settings set _rotation_reload, so no polling is needed
+                if not rotation_settings.get('enabled', False):
+                    break
+
+                # The emoji never changes between ticks; only the text is swapped in
+                custom_status_data = {'text': None, 'emoji': emoji_data or None}
+
+                # With no field to rotate, send once and then just wait for new settings
+                rotating = any(len(parts) > 1 for parts in (name_parts, state_parts, details_parts, custom_status_parts))
+                tick_timeout = rotation_delay if rotating else None
+
+                # Rotate through cached parts until a command signals new settings
+                reload = False
+                while not reload:
+                    current_name = next(name_iter)
+                    current_state = next(state_iter)
+                    current_details = next(details_iter)
+                    current_custom_status = next(custom_status_iter)
+
+                    custom_status_data['text'] = current_custom_status
+                    
+                    await self.update_presence(name=current_name, state=current_state, details=current_details, custom_status=custom_status_data)
+                    tick += 1
+
+                    try:
+                        await asyncio.wait_for(self._rotation_reload.wait(), timeout=tick_timeout)
+                        self._rotation_reload.clear()
+                        reload = True
+                    except asyncio.TimeoutError:
+                        pass
+
         except asyncio.CancelledError:
             pass
         except Exception as e:
@@ -718,25 +830,22 @@ class Presence(commands.Cog):
         3. .rotation delay 15
         4. .rotation on
         """
-        try:await ctx.message.delete()
-        except:pass
+        delete_in_background(ctx.message)
         
         config = self.load_config()
-        if 'presence' not in config:
-            config['presence'] = {}
-        if 'rotation' not in config['presence']:
-            config['presence']['rotation'] = {'enabled': False, 'delay': 60}
+        presence = config.setdefault('presence', {})
+        rotation = presence.setdefault('rotation', {'enabled': False, 'delay': 60})
 
         # check if presence is enabled first
-        if not config['presence'].get('enabled', False):
+        if not presence.get('enabled', False):
             await ctx.send(
                 format_message("Presence must be enabled first"),
-                delete_after=self.bot.config_manager.auto_delete.delay if self.bot.config_manager.auto_delete.enabled else None
+                delete_after=auto_delete_delay(self.bot)
             )
             return
 
         if setting in ['on', 'off']:
-            config['presence']['rotation']['enabled'] = setting == 'on'
+            rotation['enabled'] = setting == 'on'
             await self.save_config(config)
             
             # Start or stop rotation task
@@ -747,7 +856,7 @@ class Presence(commands.Cog):
             elif setting == 'off' and self.rotation_task and not self.rotation_task.done():
                 self.rotation_task.cancel()
                 self.rotation_task = None
-                await self.update_presence()
+                await self.update_presence(wait=True)
             
             msg = f"Presence rotation {'enabled' if setting == 'on' else 'disabled'}"
             
@@ -755,107 +864,100 @@ class Presence(commands.Cog):
             if delay < 5:
                 await ctx.send(
                     format_message("Delay must be at least 5 seconds"),
-                    delete_after=self.bot.config_manager.auto_delete.delay if self.bot.config_manager.auto_delete.enabled else None
+                    delete_after=auto_delete_delay(self.bot)
                 )
                 return
                 
-            config['presence']['rotation']['delay'] = delay
+            rotation['delay'] = delay
             await self.save_config(config)
             
-            # Restart the rotation task to apply new delay
-            if config['presence']['rotation']['enabled']:
-                if self.rotation_task and not self.rotation_task.done():
-                    self.rotation_task.cancel()
-                self.rotation_task = asyncio.create_task(self.rotate_presence())
+            # Let the rotation task apply the new delay
+            if rotation['enabled']:
+                self._reload_rotation()
             
             msg = f"Rotation delay set to {delay} seconds"
             
         else:
-            rotation = config['presence'].get('rotation', {})
             msg = f"Rotation is currently {'enabled' if rotation.get('enabled') else 'disabled'} with {rotation.get('delay', 60)}s delay"
 
         await ctx.send(
             format_message(msg),
-            delete_after=self.bot.config_manager.auto_delete.delay if self.bot.config_manager.auto_delete.enabled else None
+            delete_after=auto_delete_delay(self.bot)
+        )
+
+    # Confirmation wording for the one-word status commands
+    _STATUS_LABELS = {
+        discord.Status.dnd: "Do Not Disturb",
+        discord.Status.idle: "Idle",
+        discord.Status.online: "Online",
+        discord.Status.invisible: "Invisible",
+    }
+
+    async def _set_status(self, ctx, status):
+        """Shared body of the dnd/idle/online/invisible commands"""
+        delete_in_background(ctx.message)
+        await self.update_presence(status=status, wait=True)
+        await ctx.send(
+            format_message(f"Status set to {self._STATUS_LABELS[status]}"),
+            delete_after=auto_delete_delay(self.bot)
         )
 
     @commands.command()
     async def dnd(self, ctx):
         """Set status to dnd"""
-        try:await ctx.message.delete()
-        except:pass
-        await self.update_presence(status=discord.Status.dnd)
-        await ctx.send(
-            format_message("Status set to Do Not Disturb"),
-            delete_after=self.bot.config_manager.auto_delete.delay if self.bot.config_manager.auto_delete.enabled else None
-        )
+        await self._set_status(ctx, discord.Status.dnd)
 
     @commands.command()
     async def idle(self, ctx):
         """Set status to Idle"""
-        try:await ctx.message.delete()
-        except:pass
-        await self.update_presence(status=discord.Status.idle)
-        await ctx.send(
-            format_message("Status set to Idle"),
-            delete_after=self.bot.config_manager.auto_delete.delay if self.bot.config_manager.auto_delete.enabled else None
-        )
+        await self._set_status(ctx, discord.Status.idle)
 
     @commands.command()
     async def online(self, ctx):
         """Set status to Online"""
-        try:await ctx.message.delete()
-        except:pass
-        await self.update_presence(status=discord.Status.online)
-        await ctx.send(
-            format_message("Status set to Online"),
-            delete_after=self.bot.config_manager.auto_delete.delay if self.bot.config_manager.auto_delete.enabled else None
-        )
+        await self._set_status(ctx, discord.Status.online)
 
     @commands.command()
     async def invisible(self, ctx):
         """Set status to Invisible"""
-        try:await ctx.message.delete()
-        except:pass
-        await self.update_presence(status=discord.Status.invisible)
-        await ctx.send(
-            format_message("Status set to Invisible"),
-            delete_after=self.bot.config_manager.auto_delete.delay if self.bot.config_manager.auto_delete.enabled else None
-        )
+        await self._set_status(ctx, discord.Status.invisible)
 
     @commands.command(aliases=['st', 'setstatus'])
     async def state(self, ctx, status_type: str):
         """Set online state (online/idle/dnd/invisible)"""
-        try:await ctx.message.delete()
-        except:pass
+        delete_in_background(ctx.message)
         
         valid_statuses = ['online', 'idle', 'dnd', 'invisible']
         if status_type.lower() not in valid_statuses:
             await ctx.send(
                 format_message(f"Invalid status. Use: {', '.join(valid_statuses)}"),
-                delete_after=self.bot.config_manager.auto_delete.delay if self.bot.config_manager.auto_delete.enabled else None
+                delete_after=auto_delete_delay(self.bot)
             )
             return
 
         config = self.load_config()
-        if 'presence' not in config:
-            config['presence'] = {}
+        presence = config.setdefault('presence', {})
+
+        if presence.get('status') == status_type.lower():
+            await ctx.send(
+                format_message(f"Status is already: {status_type}"),
+                delete_after=auto_delete_delay(self.bot)
+            )
+            return
         
-        config['presence']['status'] = status_type.lower()
+        presence['status'] = status_type.lower()
         await self.save_config(config)
         # Check if rotation is enabled 
-        rotation_settings = config['presence'].get('rotation', {})
+        rotation_settings = presence.get('rotation', {})
         if rotation_settings.get('enabled', False):
-            # Restart the rotation task to pick up new settings
-            if self.rotation_task and not self.rotation_task.done():
-                self.rotation_task.cancel()
-            self.rotation_task = asyncio.create_task(self.rotate_presence())
+            # Let the rotation task pick up the new settings
+            self._reload_rotation()
         else:
             # Update regular presence if rotation disabled
-            await self.update_presence()
+            await self.update_presence(wait=True)
         await ctx.send(
             format_message(f"Status set to: {status_type}"),
-            delete_after=self.bot.config_manager.auto_delete.delay if self.bot.config_manager.auto_delete.enabled else None
+            delete_after=auto_delete_delay(self.bot)
         )
 
     @commands.command(aliases=['setbrowser'])
@@ -864,16 +966,13 @@ class Presence(commands.Cog):
         browser android - Shows as Android
         browser desktop - Shows as desktop
         browser web - Shows as browser"""
-        try:
-            await ctx.message.delete()
-        except:
-            pass
+        delete_in_background(ctx.message)
         
         # Check if browser_type was provided
         if not browser_type:
             await ctx.send(
                 format_message("Please specify a browser type: `android`, `embedded`, `desktop`, or `web`"),
-                delete_after=self.bot.config_manager.auto_delete.delay if self.bot.config_manager.auto_delete.enabled else 5
+                delete_after=auto_delete_delay(self.bot, 5)
             )
             return
         
@@ -893,7 +992,7 @@ class Presence(commands.Cog):
             valid_types = ", ".join([f"`{k}`" for k in browser_map.keys()])
             await ctx.send(
                 f"Invalid browser type: `{browser_type}`\nValid types are: {valid_types}",
-                delete_after=self.bot.config_manager.auto_delete.delay if self.bot.config_manager.auto_delete.enabled else 5
+                delete_after=auto_delete_delay(self.bot, 5)
             )
             return
         
@@ -903,7 +1002,7 @@ class Presence(commands.Cog):
         if browser_value == self.bot.current_browser:
             await ctx.send(
                 f"Already using browser property: `{browser_value}`",
-                delete_after=self.bot.config_manager.auto_delete.delay if self.bot.config_manager.auto_delete.enabled else 5
+                delete_after=auto_delete_delay(self.bot, 5)
             )
             return
         
@@ -928,38 +1027,38 @@ class Presence(commands.Cog):
             
             # Force disconnection to apply the change - this will trigger automatic reconnect
             if self.bot.ws and self.bot.ws.open:
+                # Start listening before closing so a fast reconnect isn't missed
+                reconnected = asyncio.create_task(
+                    self.bot.wait_for('ready', timeout=BROWSER_RECONNECT_TIMEOUT)
+                )
                 reason = f"Browser switch -> {browser_value}"
                 await self.bot.ws.close(code=1000, reason=reason)
+                
+                # Update status to show we're waiting for reconnect
+                await temp_msg.edit(
+                    content=f"⏳ Waiting for reconnection with `{browser_value}` browser property..."
+                )
+                
+                try:
+                    await reconnected
+                except asyncio.TimeoutError:
+                    logger.warning("No ready event within %ss after browser switch", BROWSER_RECONNECT_TIMEOUT)
             
-            # Wait a moment for reconnection to start
-            await asyncio.sleep(2)
-            
-            # Update status to show we're waiting for reconnect
-            await temp_msg.edit(
-                content=f"⏳ Waiting for reconnection with `{browser_value}` browser property..."
-            )
-            
-            # Wait a bit longer for full reconnection
-            await asyncio.sleep(3)
-            
-            # Restore previous presence
-            try:
+            # Restore previous presence; errors are ignored since it's not critical
+            with suppress(Exception):
                 await self.bot.change_presence(status=current_status, activities=current_activities)
-            except Exception:
-                # Ignore presence restoration errors - it's not critical
-                pass
                 
             # Final success message
             await temp_msg.edit(
                 content=f"✅ Browser property changed to: `{browser_value}`",
-                delete_after=self.bot.config_manager.auto_delete.delay if self.bot.config_manager.auto_delete.enabled else 5
+                delete_after=auto_delete_delay(self.bot, 5)
             )
             
         except Exception as e:
-            logger.error(f"Error during browser property change: {e}")
+            logger.error("Error during browser property change: %s", e)
             await temp_msg.edit(
                 content=f"⚠️ Error changing browser property: `{str(e)[:100]}`",
-                delete_after=self.bot.config_manager.auto_delete.delay if self.bot.config_manager.auto_delete.enabled else 5
+                delete_after=auto_delete_delay(self.bot, 5)
             )
 
     @commands.command(aliases=['cs', 'customstatus'])
@@ -968,33 +1067,36 @@ class Presence(commands.Cog):
         status hello world - Set status text
         status 👨‍💻 Working - With emoji
         status clear - Remove status"""
-        try:await ctx.message.delete()
-        except:pass
+        delete_in_background(ctx.message)
     
         # Load the full config
         config = self.load_config()
-        if 'presence' not in config:
-            config['presence'] = {}
+        presence = config.setdefault('presence', {})
     
         # Handle clearing the status
         if not content or content.lower() == 'clear':
+            if not presence.get('custom_status'):
+                await ctx.send(
+                    format_message("Custom status is already clear"),
+                    delete_after=auto_delete_delay(self.bot)
+                )
+                return
+
             # Only clear the custom_status section
-            config['presence']['custom_status'] = {}
+            presence['custom_status'] = {}
             await self.save_config(config)
 
-            rotation_settings = config['presence'].get('rotation', {})
+            rotation_settings = presence.get('rotation', {})
             if rotation_settings.get('enabled', False):
-                # Restart the rotation task to pick up new settings
-                if self.rotation_task and not self.rotation_task.done():
-                    self.rotation_task.cancel()
-                self.rotation_task = asyncio.create_task(self.rotate_presence())
-            elif config['presence'].get('enabled', False):
+                # Let the rotation task pick up the new settings
+                self._reload_rotation()
+            elif presence.get('enabled', False):
                 # Update regular presence if rotation disabled
-                await self.update_presence()
+                await self.update_presence(wait=True)
                 
             await ctx.send(
                 format_message("Custom status cleared"),
-                delete_after=self.bot.config_manager.auto_delete.delay if self.bot.config_manager.auto_delete.enabled else None
+                delete_after=auto_delete_delay(self.bot)
             )
             return
     
@@ -1004,63 +1106,63 @@ class Presence(commands.Cog):
         text = content
         emoji = None
     
-        # Ensure custom_status exists in config
-        if 'custom_status' not in config['presence']:
-            config['presence']['custom_status'] = {}
-    
         # Handle different emoji types
-        if first_part.startswith(('<:', '<a:')):  # Custom Discord emoji
-            try:
-                emoji_parts = first_part.split(':')
-                emoji = discord.PartialEmoji(name=emoji_parts[1], id=int(emoji_parts[2].strip('>')))
-                text = parts[1] if len(parts) > 1 else ''
-                config['presence']['custom_status'].update({
-                    'text': text,
-                    'emoji': {
-                        'name': emoji.name,
-                        'id': str(emoji.id)
-                    }
-                })
-            except:
-                config['presence']['custom_status'].update({'text': content, 'emoji': None})
+        if custom_emoji := _CUSTOM_EMOJI_RE.match(first_part):  # Custom Discord emoji
+            emoji = discord.PartialEmoji(name=custom_emoji.group(1), id=int(custom_emoji.group(2)))
+            text = parts[1] if len(parts) > 1 else ''
+            changes = {
+                'text': text,
+                'emoji': {
+                    'name': emoji.name,
+                    'id': str(emoji.id)
+                }
+            }
         # Standard emoji (must be an actual emoji, not just any symbol)
-        elif len(first_part) == 1 and not first_part.isalnum() and is_valid_emoji(first_part):
+        elif len(first_part) == 1 and not first_part.isalnum() and is_emoji_char(first_part):
             emoji = discord.PartialEmoji(name=first_part)
             text = parts[1] if len(parts) > 1 else ''
-            config['presence']['custom_status'].update({
+            changes = {
                 'text': text,
                 'emoji': {
                     'name': emoji.name,
                     'id': None
                 }
-            })
+            }
         else: # No emoji, treat as text
-            config['presence']['custom_status'].update({'text': content, 'emoji': None})
+            changes = {'text': content, 'emoji': None}
+
+        # Text shown in the confirmation
+        status_display = []
+        if emoji:
+            status_display.append(first_part)
+        if text:
+            status_display.append(text)
+
+        current = presence.get('custom_status') or {}
+        updated = {**current, **changes}
+        if updated == current:
+            await ctx.send(
+                format_message(f"Custom status is already: {' '.join(status_display)}"),
+                delete_after=auto_delete_delay(self.bot)
+            )
+            return
+        presence['custom_status'] = updated
     
         # Save the updated config
         await self.save_config(config)
     
         # Only update presence if rotation is disabled
-        rotation_settings = config['presence'].get('rotation', {})
+        rotation_settings = presence.get('rotation', {})
         if rotation_settings.get('enabled', False):
-            # Restart the rotation task to pick up new settings
-            if self.rotation_task and not self.rotation_task.done():
-                self.rotation_task.cancel()
-            self.rotation_task = asyncio.create_task(self.rotate_presence())
-        elif config['presence'].get('enabled', False):
+            # Let the rotation task pick up the new settings
+            self._reload_rotation()
+        elif presence.get('enabled', False):
             # Update regular presence if rotation disabled
-            await self.update_presence()
-    
-        # Show confirmation
-        status_display = []
-        if emoji:
-            status_display.append(first_part)
-        if text:
-            status_display.append(text)
-            
+            await self.update_presence(wait=True)
+
         await ctx.send(
             format_message(f"Custom status set to: {' '.join(status_display)}"),
-            delete_after=self.bot.config_manager.auto_delete.delay if self.bot.config_manager.auto_delete.enabled else None
+            delete_after=auto_delete_delay(self.bot)
         )
 
     async def cog_unload(self):
@@ -1078,13 +1180,20 @@ class Presence(commands.Cog):
                 await self.rotation_task
             except asyncio.CancelledError:
                 pass
+        if self._initial_update_task:
+            self._initial_update_task.cancel()
+        if self._pending_send and not self._pending_send.done():
+            # Stop waiting out the rate spacing, but still send what a command queued
+            self._pending_send.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._pending_send
+            with suppress(Exception):
+                await self._send_pending_presence()
         # Stop the refresh task
         self.refresh_discord_urls_periodically.cancel()
         # Reset presence to default
-        try:
+        with suppress(Exception):
             await self.update_presence(activity=None)
-        except:
-            pass
 
 async def setup(bot):
     await bot.add_cog(Presence(bot))
@@ -2,17 +2,100 @@ import discord
 from discord.ext import commands
 from typing import Optional, Union
 import logging
+import asyncio
 import datetime
-from utils.general import format_message, quote_block, get_max_message_length
+import time
+import io
+import itertools
+from collections import OrderedDict
+from utils.general import format_message, quote_block, get_max_message_length, delete_in_background, auto_delete_delay
 
 logger = logging.getLogger(__name__)
 
+USER_CACHE_TTL = 300  # Seconds a fetched user is reused before hitting the API again
+MAX_USER_CACHE = 128  # Maximum number of fetched users kept in memory
+MAX_ASSET_CACHE = 64  # Maximum number of downloaded assets kept in memory
+MAX_ASSET_CACHE_BYTES = 4 * 1024 * 1024  # Total size of downloaded assets kept in memory
+MAX_CACHED_ASSET_SIZE = 512 * 1024  # Larger downloads are sent but not cached
+
+# Bold underlined titles sent above each asset, quoted once here rather than on every send
+_AVATAR_HEADER = quote_block("```ansi\n\u001b[30m\u001b[1m\u001b[4m{name}'s Global Avatar\u001b[0m```")
+_SERVER_AVATAR_HEADER = quote_block("```ansi\n\u001b[30m\u001b[1m\u001b[4m{name}'s Server Avatar ({guild})\u001b[0m```")
+_BANNER_HEADER = quote_block("```ansi\n\u001b[30m\u001b[1m\u001b[4m{name}'s Banner\u001b[0m```")
+_GUILD_ICON_HEADER = quote_block("```ansi\n\u001b[30m\u001b[1m\u001b[4m{name}'s Guild Icon\u001b[0m```")
+_GUILD_HEADER = quote_block("```ansi\n\u001b[30m\u001b[1m\u001b[4m{name}\u001b[0m```")
+
+# Relationship status -> (symbol, label); more elegant dots instead of colored circles
+_STATUS_DISPLAY = {
+    "Online": ("●", "Online"),
+    "Idle": ("○", "Idle"),
+    "Dnd": ("⊗", "Do Not Disturb"),
+    "Offline": ("⦾", "Offline"),
+}
+
+# A single "Label [value]" row of the userinfo block
+_INFO_ROW = "\u001b[30m\u001b[0;37m{label} \u001b[30m[\u001b[0;34m{value}\u001b[30m]\n"
+
 class Profile(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        # LRU of user id -> (fetched_at, user) to avoid repeat REST lookups
+        self._user_cache = OrderedDict()
+        # LRU of CDN url -> downloaded bytes; asset urls embed the image hash so entries never go stale
+        self._asset_cache = OrderedDict()
+        self._asset_cache_bytes = 0
+        # CDN urls that failed to upload with 413, sent as links from then on
+        self._oversized_assets = OrderedDict()
+
+    async def _get_user_cached(self, user_id, ttl=USER_CACHE_TTL):
+        """bot.GetUser with a short-lived LRU cache; failed lookups are not cached"""
+        entry = self._user_cache.get(user_id)
+        if entry and time.monotonic() - entry[0] < ttl:
+            self._user_cache.move_to_end(user_id)
+            return entry[1]
+
+        user = await self.bot.GetUser(user_id)
+        if user:
+            self._user_cache[user_id] = (time.monotonic(), user)
+            self._user_cache.move_to_end(user_id)
+            while len(self._user_cache) > MAX_USER_CACHE:
+                self._user_cache.popitem(last=False)
+        return user
+
+    async def _asset_file(self, asset):
+        """asset.to_file() that reuses recently downloaded bytes"""
+        url = str(asset.url)
+        data = self._asset_cache.get(url)
+        if data is None:
+            data = await asset.read()
+            # A concurrent send of the same asset may have cached it while we downloaded
+            if len(data) <= MAX_CACHED_ASSET_SIZE and url not in self._asset_cache:
+                self._asset_cache[url] = data
+                self._asset_cache_bytes += len(data)
+                while (len(self._asset_cache) > MAX_ASSET_CACHE
+                       or self._asset_cache_bytes > MAX_ASSET_CACHE_BYTES):
+                    self._asset_cache_bytes -= len(self._asset_cache.popitem(last=False)[1])
+        else:
+            self._asset_cache.move_to_end(url)
+        return discord.File(io.BytesIO(data), filename=url.split('?', 1)[0].rsplit('/', 1)[-1])
+
+    async def _resolve_target_id(self, ctx, user_input, delete_after=None):
+        """Resolve a command's user argument to an ID, defaulting to the author.
+        Reports invalid input and returns None"""
+        if user_input is None:
+            return ctx.author.id
+        # If it's already a Member or User object
+        if isinstance(user_input, (discord.Member, discord.User)):
+            return user_input.id
+        try:
+            return int(user_input)
+        except (TypeError, ValueError):
+            await ctx.send(format_message("Invalid user ID format"), delete_after=delete_after)
+            return None
         
     async def _send_asset(self, ctx, asset, description, delete_after=None):
-        """Helper method to send Discord assets (avatars, banners, icons)
+        """Helper method to send Discord assets (avatars, banners, icons) under an already quoted description
+        The description is the content of the same message as the file/URL, so concurrent calls never interleave
         Falls back to URL if the file is too large or user doesn't have Nitro"""
         try:
             # Check if user has Nitro based on message length limit
@@ -23,23 +106,26 @@ class Profile(commands.Cog):
             url = str(asset.url)
             
             # Try to send as file for Nitro users, otherwise use URL
-            if has_nitro:
+            # The header travels in the same message as the file/URL
+            # Assets Discord already rejected as too large skip the download and upload
+            if has_nitro and url not in self._oversized_assets:
                 try:
-                    await ctx.send(quote_block(description), delete_after=delete_after)
-                    await ctx.send(file=await asset.to_file(), delete_after=delete_after)
+                    await ctx.send(description, file=await self._asset_file(asset), delete_after=delete_after)
                 except discord.HTTPException as e:
                     # If file is too large, fall back to URL
                     if e.status == 413:  # 413 = Payload Too Large
                         logger.debug(f"Asset too large, sending URL instead: {e}")
-                        await ctx.send(quote_block(description), delete_after=delete_after)
-                        await ctx.send(f"{url}", delete_after=delete_after)                    
+                        self._asset_cache_bytes -= len(self._asset_cache.pop(url, b''))
+                        self._oversized_assets[url] = None
+                        while len(self._oversized_assets) > MAX_ASSET_CACHE:
+                            self._oversized_assets.popitem(last=False)
+                        await ctx.send(f"{description}\n{url}", delete_after=delete_after)
                     else:
                         raise  # Re-raise for other HTTP exceptions
             else:
-                # Non-Nitro users get URLs directly
-                await ctx.send(quote_block(description), delete_after=delete_after)
-                await ctx.send(f"{url}", delete_after=delete_after)
-        except Exception as e:
+                # Non-Nitro users and oversized assets get URLs directly
+                await ctx.send(f"{description}\n{url}", delete_after=delete_after)
+        except discord.DiscordException as e:
             logger.error(f"Error sending asset: {e}")
             await ctx.send(format_message(f"Error sending asset: {e}"), delete_after=delete_after)
             
@@ -47,46 +133,33 @@ class Profile(commands.Cog):
     async def pfp(self, ctx, user_input: Optional[Union[discord.Member, discord.User, str]] = None):
         """Get user's pfp
         .pfp [user/user_id]"""
-        try:await ctx.message.delete()
-        except:pass
+        delete_in_background(ctx.message)
+
+        delete_after = auto_delete_delay(self.bot)
 
         try:
-            # Handle the user input
-            if user_input is None:
-                target_id = ctx.author.id
-            else:
-                # If it's already a Member or User object
-                if isinstance(user_input, (discord.Member, discord.User)):
-                    target_id = user_input.id
-                else:
-                    # Try to convert string to ID
-                    try:
-                        target_id = int(str(user_input))
-                    except ValueError:
-                        await ctx.send(format_message("Invalid user ID format"),
-                            delete_after=self.bot.config_manager.auto_delete.delay if self.bot.config_manager.auto_delete.enabled else None)
-                        return
+            target_id = await self._resolve_target_id(ctx, user_input, delete_after)
+            if target_id is None:
+                return
 
             # Fetch user to ensure we have proper data
-            target = await self.bot.GetUser(target_id)
+            target = await self._get_user_cached(target_id)
             
             if not target:
                 await ctx.send(format_message("Could not fetch user information"),
-                    delete_after=self.bot.config_manager.auto_delete.delay if self.bot.config_manager.auto_delete.enabled else None)
+                    delete_after=delete_after)
                 return
             
-            delete_after = self.bot.config_manager.auto_delete.delay if self.bot.config_manager.auto_delete.enabled else None
-            
             # Global avatar
             if target.avatar:
                 await self._send_asset(
                     ctx, 
                     target.avatar, 
-                    f"```ansi\n\u001b[30m\u001b[1m\u001b[4m{target.name}'s Global Avatar\u001b[0m```",
+                    _AVATAR_HEADER.format(name=target.name),
                     delete_after=delete_after
                 )
             else:
-                await ctx.send(quote_block(f"```ansi\n\u001b[30m\u001b[1m\u001b[4m{target.name}'s Global Avatar\u001b[0m```\nNo global avatar"),
+                await ctx.send(_AVATAR_HEADER.format(name=target.name) + "\n> No global avatar",
                     delete_after=delete_after)
 
             # Guild avatars
@@ -96,65 +169,57 @@ class Profile(commands.Cog):
                     await self._send_asset(
                         ctx, 
                         guild_avatar, 
-                        f"```ansi\n\u001b[30m\u001b[1m\u001b[4m{target.name}'s Server Avatar ({ctx.guild.name})\u001b[0m```",
+                        _SERVER_AVATAR_HEADER.format(name=target.name, guild=ctx.guild.name),
                         delete_after=delete_after
                     )
 
-            # Check other mutual guilds for guild-specific avatars
-            for guild in self.bot.guilds:
-                if guild == ctx.guild:
-                    continue
-                member = guild.get_member(target.id)
-                if member and member.guild_avatar:
-                    await self._send_asset(
-                        ctx, 
-                        member.guild_avatar, 
-                        f"```ansi\n\u001b[30m\u001b[1m\u001b[4m{target.name}'s Server Avatar ({guild.name})\u001b[0m```",
-                        delete_after=delete_after
-                    )        
+            # Check other mutual guilds for guild-specific avatars, sending them concurrently.
+            # _send_asset posts each header and its file/URL as a single message, so a
+            # guild's description can never land next to another guild's avatar.
+            current_guild = ctx.guild
+            sends = [
+                self._send_asset(
+                    ctx, 
+                    member.guild_avatar, 
+                    _SERVER_AVATAR_HEADER.format(name=target.name, guild=guild.name),
+                    delete_after=delete_after
+                )
+                for guild in self.bot.guilds
+                if guild is not current_guild and (member := guild.get_member(target_id)) and member.guild_avatar
+            ]
+            for result in await asyncio.gather(*sends, return_exceptions=True):
+                if isinstance(result, Exception):
+                    logger.error("Error sending server avatar: %s", result)
         except discord.NotFound:
             await ctx.send(format_message("User not found"),
-                delete_after=self.bot.config_manager.auto_delete.delay if self.bot.config_manager.auto_delete.enabled else None)
+                delete_after=delete_after)
         except discord.HTTPException as e:
             await ctx.send(format_message(f"Error fetching user avatar: {e}"),
-                delete_after=self.bot.config_manager.auto_delete.delay if self.bot.config_manager.auto_delete.enabled else None)
+                delete_after=delete_after)
         except Exception as e:
             logger.error(f"Error in pfp command: {e}")
             await ctx.send(format_message(f"An error occurred while fetching user avatar: {e}"),
-                delete_after=self.bot.config_manager.auto_delete.delay if self.bot.config_manager.auto_delete.enabled else None)
+                delete_after=delete_after)
                 
     @commands.command(aliases=['bn'])
     async def banner(self, ctx, user_input: Optional[Union[discord.Member, discord.User, str]] = None):
         """Get user's banner
         .banner [user/user_id]"""
-        try:await ctx.message.delete()
-        except:pass
+        delete_in_background(ctx.message)
+
+        delete_after = auto_delete_delay(self.bot)
 
         try:
-            # Handle the user input
-            if user_input is None:
-                target_id = ctx.author.id
-            else:
-                # If it's already a Member or User object
-                if isinstance(user_input, (discord.Member, discord.User)):
-                    target_id = user_input.id
-                else:
-                    # Try to convert string to ID
-                    try:
-                        target_id = int(str(user_input))
-                    except ValueError:
-                        await ctx.send(format_message("Invalid user ID format"),
-                            delete_after=self.bot.config_manager.auto_delete.delay if self.bot.config_manager.auto_delete.enabled else None)
-                        return
+            target_id = await self._resolve_target_id(ctx, user_input, delete_after)
+            if target_id is None:
+                return
         
-            delete_after = self.bot.config_manager.auto_delete.delay if self.bot.config_manager.auto_delete.enabled else None
-            
             # Fetch user to ensure we have banner data
-            fetched_user = await self.bot.GetUser(target_id)
+            fetched_user = await self._get_user_cached(target_id)
             
             if not fetched_user:
                 await ctx.send(format_message("Could not fetch user information"),
-                    delete_after=self.bot.config_manager.auto_delete.delay if self.bot.config_manager.auto_delete.enabled else None)
+                    delete_after=delete_after)
                 return
             
             # Send banner directly as file if it exists
@@ -162,69 +227,74 @@ class Profile(commands.Cog):
                 await self._send_asset(
                     ctx, 
                     fetched_user.banner, 
-                    f"```ansi\n\u001b[30m\u001b[1m\u001b[4m{fetched_user.name}'s Banner\u001b[0m```",
+                    _BANNER_HEADER.format(name=fetched_user.name),
                     delete_after=delete_after
                 )
             else:
-                await ctx.send(quote_block(f"```ansi\n\u001b[30m\u001b[1m\u001b[4m{fetched_user.name}'s Banner\u001b[0m```\nNo banner"),
+                await ctx.send(_BANNER_HEADER.format(name=fetched_user.name) + "\n> No banner",
                     delete_after=delete_after)
 
         except discord.NotFound:
             await ctx.send(format_message("User not found"),
-                delete_after=self.bot.config_manager.auto_delete.delay if self.bot.config_manager.auto_delete.enabled else None)
+                delete_after=delete_after)
         except discord.HTTPException as e:
             await ctx.send(format_message(f"Error fetching banner: {e}"),
-                delete_after=self.bot.config_manager.auto_delete.delay if self.bot.config_manager.auto_delete.enabled else None)
+                delete_after=delete_after)
         except Exception as e:
             logger.error(f"Error in banner command: {e}")
             await ctx.send(format_message(f"An error occurred while fetching user banner: {e}"),
-                delete_after=self.bot.config_manager.auto_delete.delay if self.bot.config_manager.auto_delete.enabled else None)
+                delete_after=delete_after)
             
     @commands.command(aliases=['ui'])
     async def userinfo(self, ctx, user_input: Optional[Union[discord.Member, discord.User, str]] = None):
         """Get user information 
         .userinfo [user/user_id]"""
-        try:await ctx.message.delete()
-        except:pass
+        delete_in_background(ctx.message)
+
+        delete_after = auto_delete_delay(self.bot)
+
         try:
-            # Handle the user input
-            if user_input is None:
-                target_id = ctx.author.id
-            else:
-                # If it's already a Member or User object
-                if isinstance(user_input, (discord.Member, discord.User)):
-                    target_id = user_input.id
-                else:
-                    # Try to convert string to ID
-                    try:
-                        target_id = int(str(user_input))
-                    except ValueError:
-                        await ctx.send(format_message("Invalid user ID format"),
-                            delete_after=self.bot.config_manager.auto_delete.delay if self.bot.config_manager.auto_delete.enabled else None)
-                        return
-    
-            # Fetch user profile data directly using the ID
-            fetched_user = await self.bot.GetUser(target_id)
-    
-            if not fetched_user:
-                await ctx.send(format_message("Could not fetch user information"),
-                    delete_after=self.bot.config_manager.auto_delete.delay if self.bot.config_manager.auto_delete.enabled else None)
+            target_id = await self._resolve_target_id(ctx, user_input, delete_after)
+            if target_id is None:
                 return
-
-            # Fetch user profile with mutual info
-            try:
-                user_profile = await self.bot.fetch_user_profile(
+    
+            # Fetch the user, their profile with mutual info and, if it isn't
+            # cached, their guild membership concurrently
+            member = ctx.guild.get_member(target_id) if ctx.guild else None
+            lookups = [
+                self._get_user_cached(target_id),
+                self.bot.fetch_user_profile(
                     target_id,
                     with_mutual_guilds=True,
                     with_mutual_friends=True
                 )
-            except Exception as e:
-                logger.debug(f"Could not fetch user profile: {e}")
+            ]
+            if ctx.guild and not member:
+                lookups.append(ctx.guild.fetch_member(target_id))
+            fetched_user, user_profile, *fetched_member = await asyncio.gather(*lookups, return_exceptions=True)
+
+            if isinstance(fetched_user, Exception):
+                raise fetched_user
+            if not fetched_user:
+                await ctx.send(format_message("Could not fetch user information"),
+                    delete_after=delete_after)
+                return
+
+            if isinstance(user_profile, Exception):
+                logger.debug(f"Could not fetch user profile: {user_profile}")
                 user_profile = None
+
+            if fetched_member:
+                member = fetched_member[0]
+                if isinstance(member, Exception):
+                    if not isinstance(member, discord.NotFound):
+                        logger.debug(f"Error fetching member: {member}")
+                    member = None
     
             # Get account age
-            years_ago = int((datetime.datetime.now(datetime.timezone.utc) - fetched_user.created_at).days / 365)
-            days_ago = (datetime.datetime.now(datetime.timezone.utc) - fetched_user.created_at).days
+            now = datetime.datetime.now(datetime.timezone.utc)
+            days_ago = (now - fetched_user.created_at).days
+            years_ago = days_ago // 365
             account_age = f"{years_ago} {'year' if years_ago == 1 else 'years'}"
             if days_ago < 365:
                 account_age = f"{days_ago} {'day' if days_ago == 1 else 'days'}"
@@ -239,36 +309,26 @@ class Profile(commands.Cog):
             
             # Display name if different from username
             if fetched_user.display_name != fetched_user.name:
-                info_block.append(f"\u001b[30m\u001b[0;37mDisplay Name \u001b[30m[\u001b[0;34m{fetched_user.display_name}\u001b[30m]\n")
+                info_block.append(_INFO_ROW.format(label="Display Name", value=fetched_user.display_name))
             
             # Account creation date
-            info_block.append(f"\u001b[30m\u001b[0;37mCreated \u001b[30m[\u001b[0;34m{created_at}\u001b[30m]\n")
-            info_block.append(f"\u001b[30m\u001b[0;37mAccount Age \u001b[30m[\u001b[0;34m{account_age}\u001b[30m]\n")
+            info_block.append(_INFO_ROW.format(label="Created", value=created_at))
+            info_block.append(_INFO_ROW.format(label="Account Age", value=account_age))
             
             # Status and Activity section with cleaner formatting
             try:
-                relationship = next((r for r in self.bot.relationships if r.user.id == fetched_user.id), None)
+                relationship = self.bot.get_relationship(fetched_user.id)
                 if relationship:
                     status = str(relationship.status).title()
-                    status_emoji = ""
-                    
-                    if status == "Online":
-                        status_emoji = "●"  # More elegant dots instead of colored circles
-                    elif status == "Idle":
-                        status_emoji = "○"
-                    elif status == "Dnd":
-                        status_emoji = "⊗"
-                        status = "Do Not Disturb"
-                    elif status == "Offline":
-                        status_emoji = "⦾"
+                    status_emoji, status = _STATUS_DISPLAY.get(status, ("", status))
                     
-                    info_block.append(f"\u001b[30m\u001b[0;37mStatus \u001b[30m[\u001b[0;34m{status_emoji} {status}\u001b[30m]\n")
+                    info_block.append(_INFO_ROW.format(label="Status", value=f"{status_emoji} {status}"))
                     
                     if relationship.user.activity:
                         activity_type = relationship.user.activity.type.name if hasattr(relationship.user.activity, 'type') else "Playing"
                         activity_name = relationship.user.activity.name
-                        info_block.append(f"\u001b[30m\u001b[0;37mActivity \u001b[30m[\u001b[0;34m{activity_type} {activity_name}\u001b[30m]\n")
-            except Exception as e:
+                        info_block.append(_INFO_ROW.format(label="Activity", value=f"{activity_type} {activity_name}"))
+            except AttributeError as e:
                 logger.debug(f"Could not fetch relationship status/activity: {e}")
             
             info_block.append("\n")
@@ -277,92 +337,74 @@ class Profile(commands.Cog):
             if user_profile:                # Mutual Friends
                 if hasattr(user_profile, 'mutual_friends') and user_profile.mutual_friends:
                     friend_count = len(user_profile.mutual_friends)
-                    info_block.append(f"\u001b[30m\u001b[0;37mMutual Friends \u001b[30m[\u001b[0;34m{friend_count}\u001b[30m]\n")
+                    info_block.append(_INFO_ROW.format(label="Mutual Friends", value=friend_count))
                     
-                    # List friends with truncation
-                    friend_names = [f"{friend.name}" for friend in user_profile.mutual_friends]
-                    if friend_names:
-                        if len(friend_names) > 5:
-                            # Show first 5 friends and indicate there are more
-                            friend_display = f"{', '.join(friend_names[:5])}... and {len(friend_names) - 5} more"
-                            info_block.append(f"\u001b[30m\u001b[0;37m └─ \u001b[30m[\u001b[0;34m{friend_display}\u001b[30m]\n")
-                        else:
-                            # Show all friends if 5 or fewer
-                            info_block.append(f"\u001b[30m\u001b[0;37m └─ \u001b[30m[\u001b[0;34m{', '.join(friend_names)}\u001b[30m]\n")
+                    # List up to 5 friends and indicate if there are more
+                    friend_display = ', '.join(friend.name for friend in itertools.islice(user_profile.mutual_friends, 5))
+                    if friend_count > 5:
+                        friend_display += f"... and {friend_count - 5} more"
+                    info_block.append(_INFO_ROW.format(label=" └─", value=friend_display))
                   # Mutual Guilds/Servers
                 if hasattr(user_profile, 'mutual_guilds') and user_profile.mutual_guilds:
-                    # Get guild names
-                    guild_names = []
-                    for mutual_guild in user_profile.mutual_guilds:
-                        guild = self.bot.get_guild(mutual_guild.id)
-                        if guild:
-                            guild_names.append(guild.name)
+                    # Resolve guild names lazily; only the first 5 are displayed, the rest are just counted
+                    guild_names = (
+                        guild.name for mutual_guild in user_profile.mutual_guilds
+                        if (guild := self.bot.get_guild(mutual_guild.id))
+                    )
+                    shown_guilds = list(itertools.islice(guild_names, 5))
                     
-                    if guild_names:
-                        server_count = len(guild_names)
-                        info_block.append(f"\u001b[30m\u001b[0;37mMutual Servers \u001b[30m[\u001b[0;34m{server_count}\u001b[30m]\n")
+                    if shown_guilds:
+                        more_guilds = sum(1 for _ in guild_names)
+                        server_count = len(shown_guilds) + more_guilds
+                        info_block.append(_INFO_ROW.format(label="Mutual Servers", value=server_count))
                         
-                        # List servers with truncation
-                        if len(guild_names) > 5:
-                            # Show first 5 servers and indicate there are more
-                            guild_display = f"{', '.join(guild_names[:5])}... and {len(guild_names) - 5} more"
-                            info_block.append(f"\u001b[30m\u001b[0;37m └─ \u001b[30m[\u001b[0;34m{guild_display}\u001b[30m]\n")
-                        else:
-                            # Show all servers if 5 or fewer
-                            info_block.append(f"\u001b[30m\u001b[0;37m └─ \u001b[30m[\u001b[0;34m{', '.join(guild_names)}\u001b[30m]\n")
+                        guild_display = ', '.join(shown_guilds)
+                        if more_guilds:
+                            guild_display += f"... and {more_guilds} more"
+                        info_block.append(_INFO_ROW.format(label=" └─", value=guild_display))
                 
                 # Add separator for cleaner organization
                 info_block.append("\n")
     
             # Server-specific information
             if ctx.guild:
-                try:         
-                    member = ctx.guild.get_member(target_id)
-                    if not member:
-                        # If get_member fails, try fetching the member
-                        try:
-                            member = await ctx.guild.fetch_member(target_id)
-                        except discord.NotFound:
-                            member = None
-                        except Exception as e:
-                            logger.debug(f"Error fetching member: {e}")
-                            member = None
-
+                try:
                     if member:
                         # Calculate server membership duration
-                        years_since_join = int((datetime.datetime.now(datetime.timezone.utc) - member.joined_at).days / 365)
-                        days_since_join = (datetime.datetime.now(datetime.timezone.utc) - member.joined_at).days
+                        days_since_join = (now - member.joined_at).days
+                        years_since_join = days_since_join // 365
                         join_time = f"{years_since_join} {'year' if years_since_join == 1 else 'years'}"
                         if days_since_join < 365:
                             join_time = f"{days_since_join} {'day' if days_since_join == 1 else 'days'}"
                         
                         # Server info header
-                        info_block.append(f"\u001b[30m\u001b[0;37mServer \u001b[30m[\u001b[0;34m{ctx.guild.name}\u001b[30m]\n")
+                        info_block.append(_INFO_ROW.format(label="Server", value=ctx.guild.name))
                         
                         # Join date 
                         join_date = member.joined_at.strftime("%a, %b %d, %Y %I:%M %p")
-                        info_block.append(f"\u001b[30m\u001b[0;37mJoined \u001b[30m[\u001b[0;34m{join_date}\u001b[30m]\n")
-                        info_block.append(f"\u001b[30m\u001b[0;37mMember For \u001b[30m[\u001b[0;34m{join_time}\u001b[30m]\n")
+                        info_block.append(_INFO_ROW.format(label="Joined", value=join_date))
+                        info_block.append(_INFO_ROW.format(label="Member For", value=join_time))
                         
                         # Display boosting status if applicable
                         if member.premium_since:
                             boost_since = member.premium_since.strftime("%b %d, %Y")
-                            boost_days = (datetime.datetime.now(datetime.timezone.utc) - member.premium_since).days
-                            info_block.append(f"\u001b[30m\u001b[0;37mBoosting \u001b[30m[\u001b[0;34mSince {boost_since} • {boost_days} days\u001b[30m]\n")
+                            boost_days = (now - member.premium_since).days
+                            info_block.append(_INFO_ROW.format(label="Boosting", value=f"Since {boost_since} • {boost_days} days"))
                         
-                        # Display roles (excluding @everyone)
-                        if len(member.roles) > 1:
-                            role_count = len(member.roles) - 1  # Exclude @everyone
-                            info_block.append(f"\u001b[30m\u001b[0;37mRoles \u001b[30m[\u001b[0;34m{role_count}\u001b[30m]\n")
+                        # Display roles (excluding @everyone); member.roles builds a sorted list, so read it once
+                        roles = member.roles
+                        if len(roles) > 1:
+                            role_count = len(roles) - 1  # Exclude @everyone
+                            info_block.append(_INFO_ROW.format(label="Roles", value=role_count))
                             
-                            # Show top roles if not too many
+                            # Show top roles if not too many, highest first
                             if role_count <= 6:
-                                role_names = [role.name for role in reversed(member.roles[1:])]
-                                info_block.append(f"\u001b[30m\u001b[0;37m └─ \u001b[30m[\u001b[0;34m{', '.join(role_names)}\u001b[30m]\n")
+                                role_names = [role.name for role in roles[:0:-1]]
+                                info_block.append(_INFO_ROW.format(label=" └─", value=', '.join(role_names)))
                         
                         # Show key permissions in compact format
                         if member.guild_permissions.administrator:
-                            info_block.append(f"\u001b[30m\u001b[0;37mPermissions \u001b[30m[\u001b[0;34mAdministrator\u001b[30m]\n")
+                            info_block.append(_INFO_ROW.format(label="Permissions", value="Administrator"))
                         else:
                             perms = []
                             if member.guild_permissions.manage_guild:
@@ -377,10 +419,10 @@ class Profile(commands.Cog):
                                 perms.append("Manage Messages")
                             
                             if perms:
-                                info_block.append(f"\u001b[30m\u001b[0;37mPermissions \u001b[30m[\u001b[0;34m{', '.join(perms)}\u001b[30m]\n")
+                                info_block.append(_INFO_ROW.format(label="Permissions", value=', '.join(perms)))
                     else:
-                        info_block.append(f"\u001b[30m\u001b[0;37mServer Member \u001b[30m[\u001b[0;34mNo\u001b[30m]\n")
-                except Exception as e:
+                        info_block.append(_INFO_ROW.format(label="Server Member", value="No"))
+                except (AttributeError, TypeError) as e:
                     logger.error(f"Error getting member info: {e}")
             
             # Clean closing
@@ -390,27 +432,26 @@ class Profile(commands.Cog):
             message = quote_block("".join(info_block))
     
             await ctx.send(message,
-                delete_after=self.bot.config_manager.auto_delete.delay if self.bot.config_manager.auto_delete.enabled else None)
+                delete_after=delete_after)
     
         except discord.NotFound:
             await ctx.send(format_message("User not found"),
-                delete_after=self.bot.config_manager.auto_delete.delay if self.bot.config_manager.auto_delete.enabled else None)
+                delete_after=delete_after)
         except discord.HTTPException as e:
             await ctx.send(format_message(f"Error fetching user info: {e}"),
-                delete_after=self.bot.config_manager.auto_delete.delay if self.bot.config_manager.auto_delete.enabled else None)
+                delete_after=delete_after)
         except Exception as e:
             logger.error(f"Error in userinfo command: {e}")
             await ctx.send(format_message(f"An error occurred while fetching user info: {e}"),
-                delete_after=self.bot.config_manager.auto_delete.delay if self.bot.config_manager.auto_delete.enabled else None)
+                delete_after=delete_after)
                 
     @commands.command(aliases=['gicon', 'servericon'])
     async def guildicon(self, ctx, guild_id: str = None):
         """Get a guild's icon
         .guildicon [guild_id]"""
-        try:await ctx.message.delete()
-        except:pass
+        delete_in_background(ctx.message)
         
-        delete_after = self.bot.config_manager.auto_delete.delay if self.bot.config_manager.auto_delete.enabled else None
+        delete_after = auto_delete_delay(self.bot)
         
         try:
             # If no guild ID specified, use current guild
@@ -445,11 +486,11 @@ class Profile(commands.Cog):
                 await self._send_asset(
                     ctx, 
                     guild.icon, 
-                    f"```ansi\n\u001b[30m\u001b[1m\u001b[4m{guild.name}'s Guild Icon\u001b[0m```",
+                    _GUILD_ICON_HEADER.format(name=guild.name),
                     delete_after=delete_after
                 )
             else:
-                await ctx.send(quote_block(f"```ansi\n\u001b[30m\u001b[1m\u001b[4m{guild.name}\u001b[0m```\nNo guild icon"),
+                await ctx.send(_GUILD_HEADER.format(name=guild.name) + "\n> No guild icon",
                     delete_after=delete_after)
                     
         except discord.Forbidden:
@@ -0,0 +1,72 @@
+import random
+import re
+
+import pytest
+
+pytest.importorskip("discord")
+pytest.importorskip("aiohttp")
+pytest.importorskip("unidecode")
+
+from cogs.mock_cog import _CLEAN_RE, _rewrite_clean
+
+
+def _old_clean(content: str) -> str:
+    """The sequential re.sub chain _CLEAN_RE replaced, kept as the reference behaviour"""
+    def replace_age(match):
+        age = int(match.group(1))
+        return match.group(0).replace(str(age), "18") if age < 16 else match.group(0)
+
+    age_patterns = [
+        r'(?i)(?:age|am|\'m|\s+is)\s*(\d{1,2})(?:\s*(?:y/?o|years?\s*old))?',
+        r'(?i)(?:born\s+in\s+(?:19|20)(\d{2}))',
+        r'(?i)(?:turn(?:ing|ed)?\s+)(\d{1,2})',
+    ]
+    for pattern in age_patterns:
+        content = re.sub(pattern, replace_age, content)
+
+    pronouns_map = {
+        r'\b(?:i am|im|i\'m)\b': "you're",
+        r'\biam\b': "you're",
+        r'\bi\s+am\b': "you're",
+        r'\bi\'m\b': "you're",
+        r'\bme\b': "you",
+        r'\bmy\b': "your",
+        r'\bmyself\b': "yourself",
+        r'\bi(?:\s+|\b)': "you ",
+    }
+    for pattern, replacement in pronouns_map.items():
+        content = re.sub(pattern, replacement, content, flags=re.IGNORECASE)
+    return ' '.join(content.split())
+
+
+def _new_clean(content: str) -> str:
+    return ' '.join(_CLEAN_RE.sub(_rewrite_clean, content).split())
+
+
+@pytest.mark.parametrize("text", [
+    "i is 5",
+    "i is 5 and",
+    "I  is 12 years old",
+    "i'm 12",
+    "im 9",
+    "iam 7 yo",
+    "i am 15",
+    "I AM 16",
+    "me is 5",
+    "my age is 10",
+    "i turned 13 myself",
+    "i was born in 2012",
+    "this is 14",
+])
+def test_clean_matches_sequential_subs(text):
+    assert _new_clean(text) == _old_clean(text)
+
+
+def test_clean_matches_sequential_subs_fuzz():
+    words = ["i", "I", "is", "IS", "am", "im", "i'm", "I'M", "iam", "me", "my", "myself",
+             "age", "turn", "turned", "turning", "born", "in", "2012", "1999",
+             "5", "9", "12", "15", "16", "yo", "y/o", "years", "old", "'m", "and", "\n"]
+    rng = random.Random(0)
+    for _ in range(20_000):
+        text = rng.choice(["", " ", "  "]).join(rng.choice(words) for _ in range(rng.randint(1, 6)))
+        assert _new_clean(text) == _old_clean(text), text
@@ -4,6 +4,7 @@ import base64
 import os
 import tempfile
 import shutil
+import threading
 import time
 from dataclasses import dataclass, field
 from typing import Optional, Dict, Any, Set
@@ -125,6 +126,7 @@ class ConfigManager:
     _config_cache: Dict[str, CacheEntry] = {}
     _token_update_cache = {}
     _cache_lock = asyncio.Lock()
+    _file_lock = threading.Lock()  # Serializes config file writes across the loop and worker threads
     _uid_counter: int = 1
     _used_uids: Set[int] = set()
     
@@ -1284,46 +1286,11 @@ class ConfigManager:
         if not self._validate_json(data):
             logger.error("Failed to write file: Invalid JSON data")
             return False
-            
-        # Create a backup copy first
-        backup_path = None
-        try:
-            if os.path.exists(file_path):
-                backup_path = f"{file_path}.bak"
-                shutil.copy2(file_path, backup_path)
-                
-            # Create a temporary file in the same directory as the target file
-            dir_path = os.path.dirname(file_path) or '.'
-            with tempfile.NamedTemporaryFile(mode='w', delete=False, dir=dir_path) as temp_file:
-                json_str = json.dumps(data, indent=4)
-                temp_file.write(json_str)
-                temp_file_name = temp_file.name
-                
-            # Replace the original file with the temp file atomically
-            shutil.move(temp_file_name, file_path)
-            
-            # Remove backup if all went well
-            if backup_path and os.path.exists(backup_path):
-                os.remove(backup_path)
-                
-            return True
-        except Exception as e:
-            logger.error(f"Error writing to file {file_path}: {e}")
-            # Restore backup if something went wrong and backup exists
-            if backup_path and os.path.exists(backup_path):
-                try:
-                    shutil.copy2(backup_path, file_path)
-                    os.remove(backup_path)
-                except Exception as restore_error:
-                    logger.error(f"Failed to restore from backup: {restore_error}")
-            return False
+        with self._file_lock:
+            return self._write_file_unlocked(file_path, data)
 
-    async def _safe_write_to_file_async(self, file_path: str, data: Any) -> bool:
-        """Async version of safe file writing"""
-        if not self._validate_json(data):
-            logger.error("Failed to write file: Invalid JSON data")
-            return False
-            
+    def _write_file_unlocked(self, file_path: str, data: Any) -> bool:
+        """Backup, temp-file write and atomic move; callers hold _file_lock"""
         # Create a backup copy first
         backup_path = None
         try:
@@ -1333,20 +1300,19 @@ class ConfigManager:
                 
             # Create a temporary file in the same directory as the target file
             dir_path = os.path.dirname(file_path) or '.'
-            json_str = json.dumps(data, indent=4)
-            
-            # Write to temp file
-            temp_fd, temp_path = tempfile.mkstemp(dir=dir_path)
+            temp_file_name = None
             try:
-                with os.fdopen(temp_fd, 'w') as temp_file:
+                with tempfile.NamedTemporaryFile(mode='w', delete=False, dir=dir_path) as temp_file:
+                    temp_file_name = temp_file.name
+                    json_str = data if isinstance(data, str) else json.dumps(data, indent=4)
                     temp_file.write(json_str)
-                
+                    
                 # Replace the original file with the temp file atomically
-                shutil.move(temp_path, file_path)
+                shutil.move(temp_file_name, file_path)
             finally:
                 # Ensure temp file is cleaned up if something goes wrong
-                if os.path.exists(temp_path):
-                    os.unlink(temp_path)
+                if temp_file_name and os.path.exists(temp_file_name):
+                    os.unlink(temp_file_name)
             
             # Remove backup if all went well
             if backup_path and os.path.exists(backup_path):
@@ -1364,6 +1330,20 @@ class ConfigManager:
                     logger.error(f"Failed to restore from backup: {restore_error}")
             return False
 
+    async def _safe_write_to_file_async(self, file_path: str, data: Any) -> bool:
+        """Async version of safe file writing; the disk work runs in a worker thread"""
+        if not self._validate_json(data):
+            logger.error("Failed to write file: Invalid JSON data")
+            return False
+        # Serialize on the loop so the worker never sees the dict mid-update
+        json_str = json.dumps(data, indent=4)
+        return await asyncio.to_thread(self._write_json_locked, file_path, json_str)
+
+    def _write_json_locked(self, file_path: str, json_str: str) -> bool:
+        """Worker-thread half of _safe_write_to_file_async"""
+        with self._file_lock:
+            return self._write_file_unlocked(file_path, json_str)
+
     def cleanup(self):
         """Clean up resources and caches"""
         try:
@@ -1,4 +1,5 @@
 import re
+import asyncio
 import discord
 from discord.ext import commands
 # from aiocache import caches, cached
@@ -108,6 +109,22 @@ def is_valid_emoji(emoji: str) -> bool:
     except Exception:
         return False
 
+# Per-codepoint memo of is_valid_emoji: 0 = unchecked, 1 = emoji, 2 = not an emoji.
+# A fixed 128 KiB bytearray covers the BMP and the supplementary plane where emoji live;
+# rarer codepoints above that are checked directly so message content can't grow the memo.
+_EMOJI_MEMO_LIMIT = 0x20000
+_EMOJI_MEMO = bytearray(_EMOJI_MEMO_LIMIT)
+
+def is_emoji_char(char: str) -> bool:
+    """is_valid_emoji for a single character, computed once per codepoint"""
+    cp = ord(char)
+    if cp >= _EMOJI_MEMO_LIMIT:
+        return is_valid_emoji(char)
+    flag = _EMOJI_MEMO[cp]
+    if not flag:
+        flag = _EMOJI_MEMO[cp] = 1 if is_valid_emoji(char) else 2
+    return flag == 1
+
 def filter_valid_emojis(emojis):
     return [emoji for emoji in emojis if is_valid_emoji(emoji)]
 
@@ -132,6 +149,21 @@ def format_message(content, code_block=True, escape_backticks=True):
     
     return content
 
+# Strong references to in-flight background deletes so they aren't garbage collected
+_background_deletes = set()
+
+def delete_in_background(message):
+    """Delete the invoking message without holding up the command; failures are ignored"""
+    task = asyncio.create_task(message.delete())
+    _background_deletes.add(task)
+    # Retrieve the exception so a failed delete isn't reported as unhandled
+    task.add_done_callback(lambda t: _background_deletes.discard(t) or t.cancelled() or t.exception())
+
+def auto_delete_delay(bot, default=None):
+    """delete_after value for command replies; auto_delete is read once so enabled and delay agree"""
+    auto_delete = bot.config_manager.auto_delete
+    return auto_delete.delay if auto_delete.enabled else default
+
 def quote_block(text):
     """Add > prefix to each line while preserving the content"""
     